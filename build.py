@@ -1,45 +1,121 @@
+import asyncio
 import os
 import tempfile
-import subprocess
+from typing import Callable
 
 from src.gitmit import __VERSION__
 from src.gitmit.utils.terminal import display_info, display_success, display_warning
 
+_TMP = tempfile.gettempdir()
+DIST_DIR = f"{_TMP}/gitmit"
 
-def main():
-    version = __VERSION__
-    dist_dir = os.path.join(tempfile.gettempdir(), "gitmit")
 
-    if not os.path.exists(dist_dir):
-        os.makedirs(dist_dir)
-        display_info(f"Directory '{dist_dir}' created.")
+def __load_pex() -> Callable[[list[str]], None]:
+    """Import the pex CLI entrypoint."""
+    from pex.bin import pex
 
-    output_file = os.path.join(dist_dir, f"gitmit-{version}.pex")
-    requirements_file = os.path.join(dist_dir, "requirements.txt")
+    return pex.main
 
-    # Export dependencies using uv
-    display_info("Exporting dependencies...")
-    export_result = subprocess.run(
-        ["uv", "export", "--no-hashes", "--no-dev", "--no-emit-project"],
-        capture_output=True,
-        text=True,
+
+def __run_pex(pex_main: Callable[[list[str]], None], args: list[str]) -> int:
+    """Run the pex CLI in-process and return its exit code."""
+    try:
+        pex_main(args)
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+
+        return e.code if isinstance(e.code, int) else 1
+
+    return 0
+
+
+async def __parse_requirements(stream: asyncio.StreamReader) -> list[str]:
+    """Keep only requirement specifiers from the uv export output."""
+    requirements = []
+
+    async for raw in stream:
+        line = raw.decode().strip()
+
+        if line and not line.startswith("#"):
+            requirements.append(line)
+
+    return requirements
+
+
+async def __relay_output(stream: asyncio.StreamReader) -> list[str]:
+    """Display uv progress lines as they arrive."""
+    lines = []
+
+    async for raw in stream:
+        line = raw.decode().rstrip()
+        lines.append(line)
+        display_info(line)
+
+    return lines
+
+
+async def __export_requirements() -> list[str]:
+    """Stream the locked requirements out of uv export.
+
+    The uv process is spawned before the first await, so pex can be imported
+    on the main thread (pex requires it) while uv resolves the lock.
+    """
+    process = await asyncio.create_subprocess_exec(
+        "uv",
+        "export",
+        "--no-hashes",
+        "--no-dev",
+        "--no-emit-project",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
     )
 
-    if export_result.returncode != 0:
-        raise RuntimeError(f"Failed to export dependencies: {export_result.stderr}")
+    if process.stdout is None or process.stderr is None:
+        raise RuntimeError("Failed to open uv export output")
 
-    # Filter out the "Resolved X packages" line from stderr
-    requirements = export_result.stdout
-    with open(requirements_file, "w") as f:
-        f.write(requirements)
+    requirements, stderr = await asyncio.gather(
+        __parse_requirements(process.stdout),
+        __relay_output(process.stderr),
+    )
+
+    if await process.wait() != 0:
+        raise RuntimeError(f"Failed to export dependencies: {' '.join(stderr)}")
+
+    return requirements
+
+
+async def __prepare() -> tuple[list[str], Callable[[list[str]], None]]:
+    """Export requirements while pex is imported."""
+    export = asyncio.create_task(__export_requirements())
 
-    # Build PEX using uvx
+    # @note let the task spawn uv, then import pex while uv runs
+    await asyncio.sleep(0)
+    pex_main = __load_pex()
+
+    return await export, pex_main
+
+
+def main():
+    version = __VERSION__
+
+    try:
+        os.makedirs(DIST_DIR)
+        display_info(f"Directory '{DIST_DIR}' created.")
+    except FileExistsError:
+        pass
+
+    output_file = f"{DIST_DIR}/gitmit-{version}.pex"
+
+    # Export dependencies using uv while pex is imported, requirements
+    # are handed to pex as arguments so no temporary file is needed
+    display_info("Exporting dependencies...")
+    requirements, pex_main = asyncio.run(__prepare())
+
+    # Build PEX in the current interpreter (pex is a dev dependency)
     display_info("Building PEX executable...")
-    cmd = [
-        "uvx",
-        "pex",
-        "-r",
-        requirements_file,
+    args = [
+        *requirements,
         "-o",
         output_file,
         "-e",
@@ -48,16 +124,14 @@ def main():
         "/usr/bin/env python3",
         "--no-transitive",
         "--sources-dir=src",
+        "--no-pre-install-wheels",
+        "--max-install-jobs",
+        "0",
     ]
 
-    result = subprocess.run(cmd)
-
-    if result.returncode != 0:
+    if __run_pex(pex_main, args) != 0:
         raise RuntimeError("Failed to build PEX executable")
 
-    # Cleanup temporary requirements file
-    os.remove(requirements_file)
-
     display_success(f"Build completed successfully: {output_file}")
     display_warning(
         f"a) Move file: [bold purple]mv {output_file} /usr/local/bin/gitmit[/bold purple]"
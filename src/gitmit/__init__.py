@@ -1,15 +1,7 @@
 import signal
 import sys
+from typing import TYPE_CHECKING
 
-from .services.config import init
-from .services.git import GitService
-from .tools.analyze import AnalyzeTool
-from .tools.commit import CommitSettings, CommitTool
-from .tools.config import ConfigTool
-from .tools.init import InitSettings, InitTool
-from .tools.merge import MergeSettings, MergeTool
-from .tools.update import UpdateTool
-from .tools.versioning import VersioningSettings, VersioningTool
 from .utils.args import parse_args
 from .utils.terminal import (
     Panel,
@@ -19,12 +11,40 @@ from .utils.terminal import (
     display_warning,
 )
 
+if TYPE_CHECKING:
+    from .services.config import Services
+    from .services.git import GitService
+
 __VERSION__ = "0.6.1"
 __REPO__ = "caiquearaujo/gitmit"
-config = init()
+config: "Services | None" = None
+
+
+def __get_config() -> "Services":
+    """Load the configuration on first use.
+
+    Returns:
+        Services: The services for the application.
+    """
+    global config
+
+    if config is None:
+        from .services.config import init
+
+        config = init()
+
+    return config
 
 
 def close_all():
+    if config is None:
+        return
+
+    config.commit.close()
+
+    if config.resume is not None:
+        config.resume.close()
+
     if config.database:
         config.database.close()
 
@@ -35,23 +55,97 @@ def signal_handler(signum, frame):
     sys.exit(0)
 
 
+def __run_commit(args, service: "GitService"):
+    from .tools.commit import CommitSettings, CommitTool
+
+    CommitTool(
+        service,
+        services=__get_config(),
+        settings=CommitSettings(
+            push=args.push,
+            force=args.force,
+            mode=args.mode,
+            brief=args.brief,
+            no_feat=args.no_feat,
+            debug=args.debug,
+            dry_run=args.dry_run,
+            candidates=args.candidates,
+        ),
+    ).run()
+
+
+def __run_analyze(args, service: "GitService"):
+    from .tools.analyze import AnalyzeTool
+
+    AnalyzeTool(
+        service,
+        services=__get_config(),
+    ).run()
+
+
+def __run_init(args, service: "GitService"):
+    from .tools.init import InitSettings, InitTool
+
+    InitTool(
+        service,
+        services=__get_config(),
+        settings=InitSettings(dev=args.dev, origin=args.origin),
+    ).run()
+
+
+def __run_merge(args, service: "GitService"):
+    from .tools.merge import MergeSettings, MergeTool
+
+    MergeTool(
+        service,
+        services=__get_config(),
+        settings=MergeSettings(
+            origin=args.origin,
+            destination=args.destination,
+            push=args.push,
+        ),
+    ).run()
+
+
+def __run_versioning(args, service: "GitService"):
+    from .tools.versioning import VersioningSettings, VersioningTool
+
+    VersioningTool(
+        service,
+        services=__get_config(),
+        settings=VersioningSettings(
+            version=args.version,
+            origin=args.origin,
+            force=args.force,
+            push=args.push,
+        ),
+    ).run()
+
+
 def startup(args):
     if args.command == "config":
+        from .tools.config import ConfigTool
+
         # Always show current configuration
-        ConfigTool(services=config).run()
+        ConfigTool(services=__get_config()).run()
         return
 
     if args.command == "update":
+        from .tools.update import UpdateTool
+
         # Update command does not require a git repository
         UpdateTool(__VERSION__, __REPO__).run(args.force)
         return
 
+    # @note GitPython is only imported once a command needs the repository
+    from .services.git import GitService
+
     # Only init command does not require an existing git repository
     require_repo = args.command != "init"
     service = GitService(args.path, require_repo=require_repo)
 
     env = [
-        f"Configuration file: [bold yellow]{config.path}[/bold yellow]",
+        f"Configuration file: [bold yellow]{__get_config().path}[/bold yellow]",
         f"Working directory: [bold yellow]{service.getPath()}[/bold yellow]",
     ]
 
@@ -60,80 +154,23 @@ def startup(args):
 
     display_info(Panel("\n".join(env), title="Environment"))
 
-    switcher = {
-        "commit": lambda: CommitTool(
-            service,
-            services=config,
-            settings=CommitSettings(
-                push=args.push,
-                force=args.force,
-                mode=args.mode,
-                brief=args.brief,
-                no_feat=args.no_feat,
-                debug=args.debug,
-                dry_run=args.dry_run,
-            ),
-        ).run(),
-        "analyze": lambda: AnalyzeTool(
-            service,
-            services=config,
-        ).run(),
-        "init": lambda: InitTool(
-            service,
-            services=config,
-            settings=InitSettings(dev=args.dev, origin=args.origin),
-        ).run(),
-        "merge": lambda: MergeTool(
-            service,
-            services=config,
-            settings=MergeSettings(
-                origin=args.origin,
-                destination=args.destination,
-                push=args.push,
-            ),
-        ).run(),
-        "versioning": lambda: VersioningTool(
-            service,
-            services=config,
-            settings=VersioningSettings(
-                version=args.version,
-                origin=args.origin,
-                force=args.force,
-                push=args.push,
-            ),
-        ).run(),
-    }
-
-    func = switcher.get(args.command, None)
-
-    if not func:
-        display_error(
-            "The command {command} was not found.".format(command=args.command),
-        )
-
-        return
-
-    if isinstance(func, dict):
-        func = func.get(args.action, False)
-
-        if not func:
+    # @note each tool is only imported when its command runs
+    match args.command:
+        case "commit":
+            __run_commit(args, service)
+        case "analyze":
+            __run_analyze(args, service)
+        case "init":
+            __run_init(args, service)
+        case "merge":
+            __run_merge(args, service)
+        case "versioning":
+            __run_versioning(args, service)
+        case _:
             display_error(
-                "The action {action} was not found for {command}.".format(
-                    action=args.action, command=args.command
-                ),
+                "The command {command} was not found.".format(command=args.command),
             )
 
-            return
-
-    if not callable(func):
-        display_error(
-            "Unexpected error for {command}.".format(command=args.command),
-        )
-
-        return
-
-    func()
-
 
 def main():
     signal.signal(signal.SIGINT, signal_handler)
@@ -1,12 +1,85 @@
 """LLM services."""
 
+import functools
+import hashlib
+import os
 from abc import ABC, abstractmethod
 from enum import Enum
+from typing import TYPE_CHECKING, Iterable
 
 from git import Repo
 
+from ..resources.llms import CommitPromptGenerator, CommitPromptResult
+from ..resources.prompts import PromptPair
 from ..resources.types import CommitMessage
 
+if TYPE_CHECKING:
+    from tiktoken import Encoding
+
+
+# @note above this size, prompts are estimated at ~4 characters per token
+LARGE_PROMPT_CHARS = 200_000
+PROMPT_SEPARATOR_TOKENS = 4
+
+
+@functools.lru_cache(maxsize=1)
+def cl100k_encoding() -> "Encoding":
+    """Load the cl100k_base encoding once per process.
+
+    Returns:
+        Encoding: The tiktoken encoding used to estimate prompt tokens.
+    """
+    import tiktoken
+
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_prompt_tokens(
+    encoding: "Encoding", system_prompt: str, user_prompt: str
+) -> int:
+    """Count the tokens of a prompt, encoding each file section in parallel.
+
+    Args:
+        encoding (Encoding): The tiktoken encoding to use.
+        system_prompt (str): The system prompt.
+        user_prompt (str): The user prompt.
+
+    Returns:
+        int: The number of tokens in the prompt.
+    """
+    # @note file sections start with ">>>> " as built by CommitPromptGenerator
+    head, *files = user_prompt.split("\n>>>> ")
+    chunks = [system_prompt, head, *(f"\n>>>> {file}" for file in files)]
+
+    # @note account for the boundary between the system and user prompts
+    return PROMPT_SEPARATOR_TOKENS + sum(
+        map(
+            len,
+            encoding.encode_ordinary_batch(chunks, num_threads=os.cpu_count() or 4),
+        )
+    )
+
+
+def parse_commit_candidates(contents: Iterable[str]) -> list[CommitMessage]:
+    """Parse the commit message candidates, skipping the invalid ones.
+
+    Args:
+        contents (Iterable[str]): The JSON content of each candidate.
+
+    Returns:
+        list[CommitMessage]: The candidates which are valid commit messages.
+    """
+    messages: list[CommitMessage] = []
+
+    for content in contents:
+        # @note one malformed candidate must not discard the others
+        try:
+            messages.append(CommitMessage.model_validate_json(content))
+        except ValueError:
+            continue
+
+    return messages
+
 
 class LLMAction(Enum):
     """LLM action."""
@@ -20,6 +93,17 @@ class LLMAction(Enum):
 class LLMService(ABC):
     """LLM service."""
 
+    generator: CommitPromptGenerator
+    _prompt_cache: dict[
+        tuple[str, str | None, "LLMService | None", bool, bool],
+        CommitPromptResult | PromptPair | None,
+    ]
+
+    def __init__(self):
+        """Initialize the prompt generator shared by the LLM actions."""
+        self.generator = CommitPromptGenerator()
+        self._prompt_cache = {}
+
     @abstractmethod
     def tokens_used(self) -> int:
         """Get the number of tokens used."""
@@ -76,6 +160,36 @@ class LLMService(ABC):
             CommitMessage: The generated commit message.
         """
 
+    def commit_message_candidates(
+        self,
+        repo: Repo,
+        explanation: str | None = None,
+        resume: "LLMService | None" = None,
+        no_feat: bool = False,
+        debug: bool = False,
+        k: int = 3,
+    ) -> list[CommitMessage]:
+        """Generate commit message candidates to choose from.
+
+        Services without multiple completions per request return a single candidate.
+
+        Args:
+            repo (git.Repo): The repository to generate the commit messages for.
+            explanation (str, optional): The explanation of the changes. Defaults to None.
+            resume (LLMService, optional): The resume of the changes. Defaults to None.
+            no_feat (bool, optional): Whether to ignore the `feat` commit type. Defaults to False.
+            debug (bool, optional): Whether to display debug information. Defaults to False.
+            k (int, optional): The number of candidates to generate. Defaults to 3.
+
+        Returns:
+            list[CommitMessage]: The generated commit messages.
+        """
+        message = self.commit_message(
+            repo, explanation=explanation, resume=resume, no_feat=no_feat, debug=debug
+        )
+
+        return [] if message is None else [message]
+
     @abstractmethod
     def supports(self, action: LLMAction) -> bool:
         """Check if the LLM supports the action.
@@ -86,3 +200,75 @@ class LLMService(ABC):
         Returns:
             bool: True if the LLM supports the action, False otherwise.
         """
+
+    def close(self) -> None:
+        """Release any resource held by the service."""
+
+    def _prompt(
+        self,
+        repo: Repo,
+        explanation: str | None,
+        resume: "LLMService | None",
+        no_feat: bool,
+        debug: bool,
+    ) -> CommitPromptResult | PromptPair | None:
+        """Build the prompt once per repository and options.
+
+        Args:
+            repo (git.Repo): The repository to build the prompt for.
+            explanation (str, optional): The explanation of the changes.
+            resume (LLMService, optional): The resume of the changes.
+            no_feat (bool): Whether to ignore the `feat` commit type.
+            debug (bool): Whether to display debug information.
+
+        Returns:
+            CommitPromptResult | PromptPair: The prompt or None if there are no changes.
+        """
+        # @note the key holds the resume service itself, so it can't be
+        # collected and its identity reused by another object
+        key = (str(repo.working_dir), explanation, resume, no_feat, debug)
+
+        if key in self._prompt_cache:
+            return self._prompt_cache[key]
+
+        prompt = None
+
+        if resume is not None:
+            _resume = resume.resume_changes(repo, explanation=explanation)
+
+            if _resume is not None:
+                prompt = self.generator.generate_from_resume(
+                    _resume,
+                    explanation=explanation,
+                    no_feat=no_feat,
+                )
+        else:
+            prompt = self.generator.generate(
+                repo, explanation=explanation, no_feat=no_feat, debug=debug
+            )
+
+        self._prompt_cache[key] = prompt
+        return prompt
+
+    def _response_key(
+        self, model: str, prompt: CommitPromptResult | PromptPair
+    ) -> str | None:
+        """Hash the model and prompt to look up a cached response.
+
+        Args:
+            model (str): The model which generates the response.
+            prompt (CommitPromptResult | PromptPair): The prompt sent to the model.
+
+        Returns:
+            str: The hash or None when GITMIT_CACHE is not set to 1.
+        """
+        if os.environ.get("GITMIT_CACHE") != "1":
+            return None
+
+        digest = hashlib.sha256(model.encode())
+
+        for part in (prompt.system_prompt, prompt.user_prompt):
+            digest.update(b"\x00")
+            digest.update(part.encode())
+
+        return digest.hexdigest()
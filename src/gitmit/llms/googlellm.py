@@ -1,20 +1,34 @@
 """Google LLM service."""
 
-from typing import override
+from typing import TYPE_CHECKING, Any, ClassVar, override
 
 from git import Repo
-from google import genai
-from google.genai import types as genai_types
 
-from ..resources import llms
+from ..resources.llms import CommitPromptResult
+from ..resources.prompts import PromptPair
 from ..resources.types import CommitMessage
 from ..services.database import LLMUsageDatabaseService
-from . import LLMAction, LLMService
+from . import (
+    LARGE_PROMPT_CHARS,
+    LLMAction,
+    LLMService,
+    cl100k_encoding,
+    count_prompt_tokens,
+    parse_commit_candidates,
+)
+
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types as genai_types
 
 
 class GoogleLLMService(LLMService):
     """Service for the Google LLM."""
 
+    _SUPPORTED: ClassVar[frozenset[LLMAction]] = frozenset(
+        {LLMAction.COUNT_TOKENS, LLMAction.TOKENS_USED, LLMAction.COMMIT_MESSAGE}
+    )
+
     def __init__(
         self,
         api_key: str,
@@ -22,16 +36,39 @@ class GoogleLLMService(LLMService):
         model: str = "gemini-2.0-flash",
     ):
         """Initialize the Google LLM service."""
-        self.client: genai.Client = genai.Client(api_key=api_key)
+        # @note the SDK is only imported when the service is configured
+        from google import genai
+        from google.genai import types as genai_types
+
+        super().__init__()
+        self.client: "genai.Client" = genai.Client(
+            api_key=api_key,
+            http_options=genai_types.HttpOptions(
+                retry_options=genai_types.HttpRetryOptions(
+                    attempts=3,
+                    initial_delay=1,
+                    max_delay=10,
+                    jitter=1,
+                    http_status_codes=[429, 500, 502, 503, 504],
+                )
+            ),
+        )
         self.model: str = model
+        self.model_key: str = f"google/{model}"
         self.database: LLMUsageDatabaseService = database
-        self.generator: llms.CommitPromptGenerator = llms.CommitPromptGenerator()
+        self._prompt_tokens: dict[tuple[str, str], int] = {}
+        self._generate_config: "genai_types.GenerateContentConfig" = (
+            genai_types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=CommitMessage,
+            )
+        )
 
     @override
     def tokens_used(self) -> int:
         """Get the number of tokens used."""
         self.database.start()
-        return self.database.current_month_tokens_used(f"google/{self.model}")
+        return self.database.current_month_tokens_used(self.model_key)
 
     @override
     def count_tokens(
@@ -41,39 +78,49 @@ class GoogleLLMService(LLMService):
         resume: LLMService | None = None,
         no_feat: bool = False,
         debug: bool = False,
+        exact: bool = False,
     ) -> int:
         """Count the tokens in the prompt.
 
         Args:
             prompt (str): The prompt to count the tokens.
+            exact (bool, optional): Whether to ask Google for the exact count instead of estimating it locally. Defaults to False.
         """
         try:
-            prompt = None
-
-            if resume is not None:
-                _resume = resume.resume_changes(repo, explanation=explanation)
-
-                if _resume is not None:
-                    prompt = self.generator.generate_from_resume(
-                        _resume,
-                        explanation=explanation,
-                        no_feat=no_feat,
-                    )
-            else:
-                prompt = self.generator.generate(
-                    repo, explanation=explanation, no_feat=no_feat, debug=debug
-                )
+            prompt = self._prompt(repo, explanation, resume, no_feat, debug)
 
             if prompt is None:
                 return 0
 
+            # @note keyed on both parts, so only the exact prompt that was sent
+            # or counted reuses its count
+            key = (prompt.system_prompt, prompt.user_prompt)
+
+            # @note reuse the count reported by a previous call for the same prompt
+            if key in self._prompt_tokens:
+                return self._prompt_tokens[key]
+
+            # @note a local estimate avoids a round trip to the API
+            if not exact:
+                size = len(prompt.system_prompt) + len(prompt.user_prompt)
+
+                if size > LARGE_PROMPT_CHARS:
+                    return size // 4
+
+                return count_prompt_tokens(
+                    cl100k_encoding(), prompt.system_prompt, prompt.user_prompt
+                )
+
             # type: ignore
             tokens = self.client.models.count_tokens(
                 model=self.model,
                 contents=f"{prompt.system_prompt}\n\n{prompt.user_prompt}",
             )
 
-            return int(getattr(tokens, "total_tokens", 0))
+            total = int(getattr(tokens, "total_tokens", 0))
+            self._prompt_tokens[key] = total
+
+            return total
         except Exception:
             return 0
 
@@ -106,45 +153,102 @@ class GoogleLLMService(LLMService):
             debug (bool, optional): Whether to display debug information. Defaults to False.
         """
         self.database.start()
-        prompt = None
+        prompt = self._prompt(repo, explanation, resume, no_feat, debug)
+
+        if prompt is None:
+            return None
 
-        if resume is not None:
-            _resume = resume.resume_changes(repo, explanation=explanation)
+        key = self._response_key(self.model_key, prompt)
 
-            if _resume is not None:
-                prompt = self.generator.generate_from_resume(
-                    _resume,
-                    explanation=explanation,
-                    no_feat=no_feat,
-                )
+        if key is not None and (cached := self.database.cached_response(key)):
+            return CommitMessage.model_validate_json(cached)
+
+        response = self._generate(prompt, {})
+
+        # @note the SDK already parsed the JSON against the response schema
+        parsed = getattr(response, "parsed", None)
+
+        if isinstance(parsed, CommitMessage):
+            message = parsed
+        elif response.text is not None:
+            message = CommitMessage.model_validate_json(response.text)
         else:
-            prompt = self.generator.generate(
-                repo, explanation=explanation, no_feat=no_feat, debug=debug
-            )
+            return None
+
+        if key is not None:
+            self.database.store_response(key, self.model_key, message.model_dump_json())
+
+        return message
+
+    @override
+    def commit_message_candidates(
+        self,
+        repo: Repo,
+        explanation: str | None = None,
+        resume: LLMService | None = None,
+        no_feat: bool = False,
+        debug: bool = False,
+        k: int = 3,
+    ) -> list[CommitMessage]:
+        """Generate commit message candidates in a single request.
+
+        Args:
+            repo (git.Repo): The repository to generate the commit messages for.
+            explanation (str, optional): The explanation of the changes. Defaults to None.
+            resume (LLMService, optional): The resume of the changes. Defaults to None.
+            no_feat (bool, optional): Whether to ignore the `feat` commit type. Defaults to False.
+            debug (bool, optional): Whether to display debug information. Defaults to False.
+            k (int, optional): The number of candidates to generate. Defaults to 3.
+        """
+        self.database.start()
+        prompt = self._prompt(repo, explanation, resume, no_feat, debug)
 
         if prompt is None:
-            return None
+            return []
+
+        response = self._generate(prompt, {"candidate_count": k})
+        texts: list[str] = []
+
+        for candidate in response.candidates or []:
+            parts = candidate.content.parts if candidate.content else None
+            text = "".join(part.text or "" for part in parts or [])
+
+            if text:
+                texts.append(text)
+
+        return parse_commit_candidates(texts)
+
+    def _generate(
+        self, prompt: CommitPromptResult | PromptPair, config: dict[str, Any]
+    ) -> "genai_types.GenerateContentResponse":
+        """Generate content for the prompt and record its token usage.
+
+        Args:
+            prompt (CommitPromptResult | PromptPair): The prompt to send.
+            config (dict[str, Any]): Extra settings for the generate config.
 
+        Returns:
+            GenerateContentResponse: The response of the model.
+        """
         # type: ignore
         response = self.client.models.generate_content(
             model=self.model,
             contents=prompt.user_prompt,
-            config=genai_types.GenerateContentConfig(
-                system_instruction=prompt.system_prompt,
-                response_mime_type="application/json",
-                response_schema=CommitMessage,
+            config=self._generate_config.model_copy(
+                update={"system_instruction": prompt.system_prompt, **config}
             ),
         )
 
-        text = response.text
         total = int(getattr(response.usage_metadata, "total_token_count", 0))
+        prompt_tokens = getattr(response.usage_metadata, "prompt_token_count", None)
 
-        self.database.insert_token_usage(total, f"google/{self.model}")
-
-        if text is None:
-            return None
+        if prompt_tokens is not None:
+            self._prompt_tokens[(prompt.system_prompt, prompt.user_prompt)] = int(
+                prompt_tokens
+            )
 
-        return CommitMessage.model_validate_json(text)
+        self.database.insert_token_usage(total, self.model_key)
+        return response
 
     @override
     def supports(self, action: LLMAction) -> bool:
@@ -156,8 +260,4 @@ class GoogleLLMService(LLMService):
         Returns:
             bool: True if the LLM supports the action, False otherwise.
         """
-        return action in [
-            LLMAction.COUNT_TOKENS,
-            LLMAction.TOKENS_USED,
-            LLMAction.COMMIT_MESSAGE,
-        ]
+        return action in self._SUPPORTED
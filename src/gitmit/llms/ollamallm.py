@@ -1,26 +1,41 @@
 """Ollama LLM service."""
 
-from typing import override
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, ClassVar, override
 
-import tiktoken
 from git import Repo
-from ollama import Client
 
 from ..resources import llms
 from ..resources.types import CommitMessage
-from . import LLMAction, LLMService
+from . import (
+    LARGE_PROMPT_CHARS,
+    LLMAction,
+    LLMService,
+    cl100k_encoding,
+    count_prompt_tokens,
+)
+
+if TYPE_CHECKING:
+    from ollama import Client
 
 
 class OllamaLLMService(LLMService):
     """Service for the Ollama LLM."""
 
+    _SUPPORTED: ClassVar[frozenset[LLMAction]] = frozenset(
+        {LLMAction.RESUME_CHANGES, LLMAction.COMMIT_MESSAGE}
+    )
+
     def __init__(
         self, host: str = "http://localhost:11434", model: str = "llama3.1:8b"
     ):
         """Initialize the Ollama LLM service."""
-        self.client: Client = Client(host=host)
+        from ollama import Client
+
+        super().__init__()
+        self.client: "Client" = Client(host=host)
         self.model: str = model
-        self.generator: llms.CommitPromptGenerator = llms.CommitPromptGenerator()
+        self._commit_schema: dict = CommitMessage.model_json_schema()
 
     @override
     def tokens_used(self) -> int:
@@ -41,29 +56,27 @@ class OllamaLLMService(LLMService):
         Args:
             prompt (str): The prompt to count the tokens.
         """
-        prompt = None
-
-        if resume is not None:
-            _resume = resume.resume_changes(repo, explanation=explanation)
-
-            if _resume is not None:
-                prompt = self.generator.generate_from_resume(
-                    _resume,
-                    explanation=explanation,
-                    no_feat=no_feat,
-                )
-        else:
-            prompt = self.generator.generate(
-                repo, explanation=explanation, no_feat=no_feat, debug=debug
-            )
+        # @note load the encoding while the prompt and resume are built
+        executor = ThreadPoolExecutor(max_workers=1)
+        encoding = executor.submit(cl100k_encoding)
 
-        if prompt is None:
-            return 0
+        try:
+            prompt = self._prompt(repo, explanation, resume, no_feat, debug)
 
-        encoding = tiktoken.get_encoding("cl100k_base")
-        message = f"{prompt.system_prompt}\n\n---\n\n{prompt.user_prompt}"
+            if prompt is None:
+                return 0
 
-        return len(encoding.encode(message))
+            size = len(prompt.system_prompt) + len(prompt.user_prompt)
+
+            if size > LARGE_PROMPT_CHARS:
+                return size // 4
+
+            return count_prompt_tokens(
+                encoding.result(), prompt.system_prompt, prompt.user_prompt
+            )
+        finally:
+            # @note early returns must not wait for the encoding to load
+            executor.shutdown(wait=False, cancel_futures=True)
 
     @override
     def resume_changes(
@@ -107,9 +120,7 @@ class OllamaLLMService(LLMService):
             no_feat (bool, optional): Whether to ignore the `feat` commit type. Defaults to False.
             debug (bool, optional): Whether to display debug information. Defaults to False.
         """
-        prompt = self.generator.generate(
-            repo, explanation=explanation, no_feat=no_feat, debug=debug
-        )
+        prompt = self._prompt(repo, explanation, None, no_feat, debug)
 
         if prompt is None:
             return None
@@ -118,7 +129,7 @@ class OllamaLLMService(LLMService):
             model=self.model,
             prompt=prompt.user_prompt,
             system=prompt.system_prompt,
-            format=CommitMessage.model_json_schema(),
+            format=self._commit_schema,
         )
 
         return CommitMessage.model_validate_json(response["response"])
@@ -133,4 +144,4 @@ class OllamaLLMService(LLMService):
         Returns:
             bool: True if the LLM supports the action, False otherwise.
         """
-        return action in [LLMAction.RESUME_CHANGES, LLMAction.COMMIT_MESSAGE]
+        return action in self._SUPPORTED
@@ -1,20 +1,36 @@
 """OpenRouter LLM service."""
 
-from typing import Any, override
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, ClassVar, override
 
-import requests
-import tiktoken
 from git import Repo
+from pydantic_core import from_json, to_json
 
-from ..resources import llms
+from ..resources.llms import CommitPromptResult
+from ..resources.prompts import PromptPair
 from ..resources.types import CommitMessage
 from ..services.database import LLMUsageDatabaseService
-from . import LLMAction, LLMService
+from . import (
+    LARGE_PROMPT_CHARS,
+    LLMAction,
+    LLMService,
+    cl100k_encoding,
+    count_prompt_tokens,
+    parse_commit_candidates,
+)
+
+if TYPE_CHECKING:
+    import requests
 
 
 class OpenRouterLLMService(LLMService):
     """Service for the OpenRouter LLM."""
 
+    _SUPPORTED: ClassVar[frozenset[LLMAction]] = frozenset(
+        {LLMAction.COUNT_TOKENS, LLMAction.TOKENS_USED, LLMAction.COMMIT_MESSAGE}
+    )
+
     def __init__(
         self,
         api_key: str,
@@ -30,20 +46,53 @@ class OpenRouterLLMService(LLMService):
             model (str, optional): The model to use. Defaults to "anthropic/claude-3.5-sonnet".
             providers (list[str], optional): List of providers to prioritize. Defaults to None.
         """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        super().__init__()
         self.api_key: str = api_key
         self.model: str = model
+        self.model_key: str = f"openrouter/{model}"
         self.database: LLMUsageDatabaseService = database
         self.providers: list[str] | None = (
             [p.strip() for p in providers if p.strip()] if providers else None
         )
         self.base_url: str = "https://openrouter.ai/api/v1/chat/completions"
-        self.generator: llms.CommitPromptGenerator = llms.CommitPromptGenerator()
+        # @note turned off once the endpoint rejects a compressed body
+        self.compress: bool = True
+
+        # @note keep the HTTPS connection alive between requests and retry
+        # transient failures, honoring Retry-After on 429 and 503
+        self.session: "requests.Session" = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=4,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=1,
+                    backoff_max=10,
+                    backoff_jitter=1,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=None,
+                    raise_on_status=False,
+                ),
+            ),
+        )
+        self.session.headers.update(
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            }
+        )
 
     @override
     def tokens_used(self) -> int:
         """Get the number of tokens used."""
         self.database.start()
-        return self.database.current_month_tokens_used(f"openrouter/{self.model}")
+        return self.database.current_month_tokens_used(self.model_key)
 
     @override
     def count_tokens(
@@ -64,29 +113,27 @@ class OpenRouterLLMService(LLMService):
         Returns:
             int: The estimated number of tokens in the prompt.
         """
-        prompt = None
+        # @note load the encoding while the prompt and resume are built
+        executor = ThreadPoolExecutor(max_workers=1)
+        encoding = executor.submit(cl100k_encoding)
 
-        if resume is not None:
-            _resume = resume.resume_changes(repo, explanation=explanation)
+        try:
+            prompt = self._prompt(repo, explanation, resume, no_feat, debug)
 
-            if _resume is not None:
-                prompt = self.generator.generate_from_resume(
-                    _resume,
-                    explanation=explanation,
-                    no_feat=no_feat,
-                )
-        else:
-            prompt = self.generator.generate(
-                repo, explanation=explanation, no_feat=no_feat, debug=debug
-            )
+            if prompt is None:
+                return 0
 
-        if prompt is None:
-            return 0
+            size = len(prompt.system_prompt) + len(prompt.user_prompt)
 
-        encoding = tiktoken.get_encoding("cl100k_base")
-        message = f"{prompt.system_prompt}\n\n---\n\n{prompt.user_prompt}"
+            if size > LARGE_PROMPT_CHARS:
+                return size // 4
 
-        return len(encoding.encode(message))
+            return count_prompt_tokens(
+                encoding.result(), prompt.system_prompt, prompt.user_prompt
+            )
+        finally:
+            # @note early returns must not wait for the encoding to load
+            executor.shutdown(wait=False, cancel_futures=True)
 
     @override
     def resume_changes(self, repo: Repo, explanation: str | None = None) -> str | None:
@@ -117,25 +164,66 @@ class OpenRouterLLMService(LLMService):
             debug (bool, optional): Whether to display debug information. Defaults to False.
         """
         self.database.start()
-        prompt = None
+        prompt = self._prompt(repo, explanation, resume, no_feat, debug)
 
-        if resume is not None:
-            _resume = resume.resume_changes(repo, explanation=explanation)
+        if prompt is None:
+            return None
 
-            if _resume is not None:
-                prompt = self.generator.generate_from_resume(
-                    _resume,
-                    explanation=explanation,
-                    no_feat=no_feat,
-                )
-        else:
-            prompt = self.generator.generate(
-                repo, explanation=explanation, no_feat=no_feat, debug=debug
-            )
+        key = self._response_key(self.model_key, prompt)
 
-        if prompt is None:
+        if key is not None and (cached := self.database.cached_response(key)):
+            return CommitMessage.model_validate_json(cached)
+
+        contents = self._complete(prompt, 1)
+
+        if not contents:
             return None
 
+        message = CommitMessage.model_validate_json(contents[0])
+
+        if key is not None:
+            self.database.store_response(key, self.model_key, message.model_dump_json())
+
+        return message
+
+    @override
+    def commit_message_candidates(
+        self,
+        repo: Repo,
+        explanation: str | None = None,
+        resume: LLMService | None = None,
+        no_feat: bool = False,
+        debug: bool = False,
+        k: int = 3,
+    ) -> list[CommitMessage]:
+        """Generate commit message candidates in a single request.
+
+        Args:
+            repo (git.Repo): The repository to generate the commit messages for.
+            explanation (str, optional): The explanation of the changes. Defaults to None.
+            resume (LLMService, optional): The resume of the changes. Defaults to None.
+            no_feat (bool, optional): Whether to ignore the `feat` commit type. Defaults to False.
+            debug (bool, optional): Whether to display debug information. Defaults to False.
+            k (int, optional): The number of candidates to generate. Defaults to 3.
+        """
+        self.database.start()
+        prompt = self._prompt(repo, explanation, resume, no_feat, debug)
+
+        if prompt is None:
+            return []
+
+        return parse_commit_candidates(self._complete(prompt, k))
+
+    def _complete(self, prompt: CommitPromptResult | PromptPair, n: int) -> list[str]:
+        """Stream a chat completion and collect the content of each choice.
+
+        Args:
+            prompt (CommitPromptResult | PromptPair): The prompt to send.
+            n (int): The number of choices to generate.
+
+        Returns:
+            list[str]: The content of each non-empty choice.
+        """
         body: dict[str, Any] = {
             "model": self.model,
             "messages": [
@@ -143,36 +231,110 @@ class OpenRouterLLMService(LLMService):
                 {"role": "user", "content": prompt.user_prompt},
             ],
             "response_format": {"type": "json_object"},
+            "stream": True,
         }
 
+        if n > 1:
+            body["n"] = n
+
         if self.providers:
             body["provider"] = {
                 "only": self.providers,
             }
 
-        response = requests.post(
-            self.base_url,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            json=body,
-            timeout=120,
-        )
+        # @note pydantic_core serializes the diff-sized body much faster than json
+        payload = to_json(body)
+
+        # @note large diffs compress several times over, cheaply at level 1
+        if self.compress and len(payload) > 32_768:
+            response = self.session.post(
+                self.base_url,
+                data=gzip.compress(payload, compresslevel=1),
+                headers={"Content-Encoding": "gzip"},
+                timeout=120,
+                stream=True,
+            )
+
+            # @note a rejected compressed body is sent again as plain JSON
+            if self.__rejects_gzip(response):
+                response.close()
+                self.compress = False
+                response = self.__post(payload)
+        else:
+            response = self.__post(payload)
 
         response.raise_for_status()
-        data = response.json()
+        contents: dict[int, list[str]] = {}
 
-        if data is None:
-            return None
+        # @note decode the server-sent events as they arrive
+        with response:
+            for line in response.iter_lines():
+                if not line.startswith(b"data: "):
+                    continue
 
-        if "usage" in data:
-            self.database.insert_token_usage(
-                data["usage"]["total_tokens"], f"openrouter/{self.model}"
-            )
+                if line == b"data: [DONE]":
+                    break
+
+                data = from_json(line[6:])
+
+                if not isinstance(data, dict):
+                    continue
+
+                # @note errors may be reported as an object or as a plain string
+                if error := data.get("error"):
+                    message = error.get("message") if isinstance(error, dict) else None
+                    raise RuntimeError(message or error)
+
+                # @note usage-only and finish chunks carry no delta content
+                for choice in data.get("choices") or []:
+                    delta = choice.get("delta")
+                    content = delta.get("content") if isinstance(delta, dict) else None
 
-        content = data["choices"][0]["message"]["content"]
-        return CommitMessage.model_validate_json(content)
+                    if content:
+                        contents.setdefault(choice.get("index", 0), []).append(content)
+
+                usage = data.get("usage")
+
+                if isinstance(usage, dict) and usage.get("total_tokens"):
+                    self.database.insert_token_usage(
+                        usage["total_tokens"], self.model_key
+                    )
+
+        return ["".join(contents[index]) for index in sorted(contents)]
+
+    def __rejects_gzip(self, response: "requests.Response") -> bool:
+        """Check if a response rejected the compressed request body.
+
+        Args:
+            response (requests.Response): The response to the compressed request.
+
+        Returns:
+            bool: True on 415, or on a 400 whose body points at the encoding.
+        """
+        if response.status_code == 415:
+            return True
+
+        if response.status_code != 400:
+            return False
+
+        body = response.text.lower()
+        return any(word in body for word in ("gzip", "encoding", "compress"))
+
+    def __post(self, payload: bytes) -> "requests.Response":
+        """Post an uncompressed chat completion request.
+
+        Args:
+            payload (bytes): The JSON body of the request.
+
+        Returns:
+            requests.Response: The streamed response.
+        """
+        return self.session.post(self.base_url, data=payload, timeout=120, stream=True)
+
+    @override
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
 
     @override
     def supports(self, action: LLMAction) -> bool:
@@ -184,8 +346,4 @@ class OpenRouterLLMService(LLMService):
         Returns:
             bool: True if the LLM supports the action, False otherwise.
         """
-        return action in [
-            LLMAction.COUNT_TOKENS,
-            LLMAction.TOKENS_USED,
-            LLMAction.COMMIT_MESSAGE,
-        ]
+        return action in self._SUPPORTED
@@ -5,6 +5,7 @@ This module provides deterministic analysis of git changes to help
 the LLM understand the context and magnitude of modifications.
 """
 
+import functools
 import re
 from dataclasses import dataclass, field
 from enum import Enum
@@ -12,6 +13,9 @@ from typing import Any, Dict, List
 
 from ..resources.files import File
 
+# Pattern ending in `\.ext$`, which is a plain extension when nothing precedes it
+_EXTENSION_PATTERN = re.compile(r"\\\.(\w+)\$$")
+
 
 class ChangeMagnitude(Enum):
     """Magnitude of changes - helps LLM calibrate response appropriately."""
@@ -37,7 +41,7 @@ class ChangeCategory(Enum):
     DEPENDENCIES = "dependencies"  # Package management files
 
 
-@dataclass
+@dataclass(slots=True)
 class FileAnalysis:
     """Analysis of a single file's changes."""
 
@@ -62,7 +66,7 @@ class FileAnalysis:
         return self.lines_added - self.lines_removed
 
 
-@dataclass
+@dataclass(slots=True)
 class ChangeAnalysis:
     """Complete analysis of all changes in the repository."""
 
@@ -77,13 +81,17 @@ class ChangeAnalysis:
     suggested_types: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
     context_hints: list[str] = field(default_factory=list)
+    _context: str | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def net_changes(self) -> int:
         return self.total_lines_added - self.total_lines_removed
 
     def to_context_string(self) -> str:
-        """Generate a context string for the LLM prompt."""
+        """Generate a context string for the LLM prompt, once per analysis."""
+        if self._context is not None:
+            return self._context
+
         lines = [
             f"CHANGE MAGNITUDE: {self.magnitude.value.upper()}",
             f"CHANGE CATEGORY: {self.category.value.upper()}",
@@ -104,7 +112,8 @@ class ChangeAnalysis:
             for hint in self.context_hints:
                 lines.append(f"  • {hint}")
 
-        return "\n".join(lines)
+        self._context = "\n".join(lines)
+        return self._context
 
 
 class ChangeAnalyzer:
@@ -177,49 +186,148 @@ class ChangeAnalyzer:
     ]
 
     # Patterns that suggest specific changes
+    # @note diff lines are single-line, so `[ \t]*` never scans across lines
     FUNCTION_PATTERNS = [
-        r"^[\+\-]\s*(def |async def |function |const \w+ = \(|const \w+ = async)",
-        r"^[\+\-]\s*(export (default )?(function|const))",
+        r"^[+-][ \t]*(?:def |async def |function |const \S+ = \(|const \S+ = async)",
+        r"^[+-][ \t]*export (?:default )?(?:function|const)",
     ]
 
     CLASS_PATTERNS = [
-        r"^[\+\-]\s*class \w+",
-        r"^[\+\-]\s*export (default )?class",
+        r"^[+-][ \t]*class \S",
+        r"^[+-][ \t]*export (?:default )?class",
     ]
 
+    # Changed lines above which only this many leading lines are scanned for structure
+    STRUCTURE_SCAN_LIMIT = 5000
+
     def __init__(self):
-        self._compile_patterns()
+        (
+            self._ext_category,
+            self._config_re,
+            self._test_re,
+            self._doc_re,
+            self._dep_re,
+            self._struct_re,
+        ) = self._compile_patterns()
+
+    @classmethod
+    @functools.cache
+    def _compile_patterns(cls) -> tuple[
+        Dict[str, set[str]],
+        re.Pattern[str],
+        re.Pattern[str],
+        re.Pattern[str],
+        re.Pattern[str],
+        re.Pattern[str],
+    ]:
+        """Pre-compile regex patterns once per class, shared by its instances."""
+        # @note plain `\.ext$` patterns become a single suffix lookup per file
+        ext_category: Dict[str, set[str]] = {}
+        residual: Dict[str, List[str]] = {}
+
+        for flag, patterns in (
+            ("is_config", cls.CONFIG_PATTERNS),
+            ("is_test", cls.TEST_PATTERNS),
+            ("is_doc", cls.DOC_PATTERNS),
+            ("is_dependency", cls.DEPENDENCY_PATTERNS),
+        ):
+            for pattern in patterns:
+                match = _EXTENSION_PATTERN.search(pattern)
+
+                if match and match.start() == 0:
+                    suffix = "." + match.group(1).lower()
+                    ext_category.setdefault(suffix, set()).add(flag)
+
+            # Patterns ending in an extension already looked up are redundant
+            residual[flag] = [
+                p
+                for p in patterns
+                if not (
+                    (match := _EXTENSION_PATTERN.search(p))
+                    and flag in ext_category.get("." + match.group(1).lower(), ())
+                )
+            ]
+
+        # @note filenames are lowercased once, so patterns match case-sensitively
+        return (
+            ext_category,
+            cls._union(residual["is_config"]),
+            cls._union(residual["is_test"]),
+            cls._union(residual["is_doc"]),
+            cls._union(residual["is_dependency"]),
+            re.compile(
+                "(?P<func>{func})|(?P<cls>{cls})".format(
+                    func="|".join(cls.FUNCTION_PATTERNS),
+                    cls="|".join(cls.CLASS_PATTERNS),
+                ),
+                re.MULTILINE,
+            ),
+        )
+
+    @staticmethod
+    def _union(patterns: List[str]) -> re.Pattern[str]:
+        """Join lowercased patterns into a single alternation."""
+        # An empty alternation would match everything, so never match instead
+        return re.compile("|".join(f"(?:{p.lower()})" for p in patterns) or r"(?!)")
+
+    def _matches_any(self, text: str, pattern: re.Pattern[str]) -> bool:
+        """Check if text matches any alternative of the compiled pattern."""
+        return bool(pattern.search(text))
 
-    def _compile_patterns(self):
-        """Pre-compile regex patterns for performance."""
-        self._config_re = [re.compile(p, re.IGNORECASE) for p in self.CONFIG_PATTERNS]
-        self._test_re = [re.compile(p, re.IGNORECASE) for p in self.TEST_PATTERNS]
-        self._doc_re = [re.compile(p, re.IGNORECASE) for p in self.DOC_PATTERNS]
-        self._dep_re = [re.compile(p, re.IGNORECASE) for p in self.DEPENDENCY_PATTERNS]
-        self._func_re = [re.compile(p, re.MULTILINE) for p in self.FUNCTION_PATTERNS]
-        self._class_re = [re.compile(p, re.MULTILINE) for p in self.CLASS_PATTERNS]
+    def _detect_structure(self, content: str) -> tuple[bool, bool]:
+        """Detect function and class changes in a single pass over the content."""
+        has_functions = False
+        has_classes = False
+
+        for match in self._struct_re.finditer(content):
+            if match.group("func") is not None:
+                has_functions = True
+            else:
+                has_classes = True
 
-    def _matches_any(self, text: str, patterns: List[re.Pattern[str]]) -> bool:
-        """Check if text matches any of the compiled patterns."""
-        return any(p.search(text) for p in patterns)
+            if has_functions and has_classes:
+                break
+
+        return has_functions, has_classes
 
     def _categorize_file(self, filename: str) -> Dict[str, bool]:
         """Categorize a file based on its name/path."""
+        filename = filename.lower()
+        dot = filename.rfind(".")
+        flags = self._ext_category.get(filename[dot:], ()) if dot != -1 else ()
+
         return {
-            "is_config": self._matches_any(filename, self._config_re),
-            "is_test": self._matches_any(filename, self._test_re),
-            "is_doc": self._matches_any(filename, self._doc_re),
-            "is_dependency": self._matches_any(filename, self._dep_re),
+            flag: flag in flags or self._matches_any(filename, patterns)
+            for flag, patterns in (
+                ("is_config", self._config_re),
+                ("is_test", self._test_re),
+                ("is_doc", self._doc_re),
+                ("is_dependency", self._dep_re),
+            )
         }
 
     def _analyze_diff_content(self, content: str) -> Dict[str, Any]:
         """Analyze diff content for specific patterns."""
-        has_function_changes = self._matches_any(content, self._func_re)
-        has_class_changes = self._matches_any(content, self._class_re)
-
         # Count actual changes (lines starting with + or -)
-        lines_added = len(re.findall(r"^\+[^+]", content, re.MULTILINE))
-        lines_removed = len(re.findall(r"^-[^-]", content, re.MULTILINE))
+        lines_added = self._count_changed_lines(content, "+")
+        lines_removed = self._count_changed_lines(content, "-")
+
+        # @note huge diffs only scan a bounded prefix, whatever it finds is real
+        scanned = content
+
+        if lines_added + lines_removed > self.STRUCTURE_SCAN_LIMIT:
+            end = -1
+
+            for _ in range(self.STRUCTURE_SCAN_LIMIT):
+                end = content.find("\n", end + 1)
+
+                if end == -1:
+                    break
+
+            if end != -1:
+                scanned = content[:end]
+
+        has_function_changes, has_class_changes = self._detect_structure(scanned)
 
         # Detect rename-only changes (similar removed/added with small differences)
         rename_only = self._detect_rename_only(content, lines_added, lines_removed)
@@ -232,6 +340,25 @@ class ChangeAnalyzer:
             "rename_only": rename_only,
         }
 
+    def _count_changed_lines(self, content: str, marker: str) -> int:
+        """
+        Count lines starting with a single marker, skipping `+++`/`---` style headers.
+
+        Equivalent to counting `^<marker>[^<marker>]` matches, but done with
+        `str.count` so no match list is built for large diffs.
+        """
+        double = marker * 2
+        count = content.count("\n" + marker) - content.count("\n" + double)
+
+        if content.startswith(marker) and not content.startswith(double):
+            count += 1
+
+        # A trailing marker with nothing after it is not a changed line
+        if content == marker or content.endswith("\n" + marker):
+            count -= 1
+
+        return count
+
     def _detect_rename_only(self, content: str, added: int, removed: int) -> bool:
         """
         Detect if changes are primarily variable/function renames.
@@ -257,8 +384,7 @@ class ChangeAnalyzer:
             1 if content and not content.endswith("\n") else 0
         )
 
-        has_functions = self._matches_any(content, self._func_re)
-        has_classes = self._matches_any(content, self._class_re)
+        has_functions, has_classes = self._detect_structure(content)
 
         return FileAnalysis(
             filename=filename,
@@ -279,20 +405,34 @@ class ChangeAnalyzer:
             filename=filename, is_new=False, **categories, **diff_analysis
         )
 
-    def _determine_magnitude(self, analyses: list[FileAnalysis]) -> ChangeMagnitude:
+    def _determine_magnitude(
+        self, analyses: list[FileAnalysis], total_changes: int | None = None
+    ) -> ChangeMagnitude:
         """Determine the magnitude of changes based on file analyses."""
         if not analyses:
             return ChangeMagnitude.TRIVIAL
 
         total_files = len(analyses)
-        total_changes = sum(a.total_changes for a in analyses)
-        has_structural = any(
-            a.has_function_changes or a.has_class_changes for a in analyses
-        )
-        all_rename = all(a.rename_only for a in analyses if not a.is_new)
+
+        # @note past the LARGE limits nothing else matters, so exit early
+        if total_files > 15:
+            return ChangeMagnitude.MAJOR
+
+        if total_changes is None:
+            total_changes = 0
+
+            for analysis in analyses:
+                total_changes += analysis.total_changes
+
+                if total_changes > 500:
+                    return ChangeMagnitude.MAJOR
 
         # Trivial: very small changes, likely typos or renames
         if total_changes <= 5 and total_files == 1:
+            single = analyses[0]
+            all_rename = single.is_new or single.rename_only
+            has_structural = single.has_function_changes or single.has_class_changes
+
             if all_rename or not has_structural:
                 return ChangeMagnitude.TRIVIAL
 
@@ -311,13 +451,21 @@ class ChangeAnalyzer:
         # Major: very significant changes
         return ChangeMagnitude.MAJOR
 
-    def _determine_category(self, analyses: list[FileAnalysis]) -> ChangeCategory:
+    def _determine_category(
+        self,
+        analyses: list[FileAnalysis],
+        new_files: list[FileAnalysis] | None = None,
+        modified_files: list[FileAnalysis] | None = None,
+        total_added: int | None = None,
+        total_removed: int | None = None,
+    ) -> ChangeCategory:
         """Determine the primary category of changes."""
         if not analyses:
             return ChangeCategory.MODIFICATIONS
 
-        new_files = [a for a in analyses if a.is_new]
-        modified_files = [a for a in analyses if not a.is_new]
+        if new_files is None or modified_files is None:
+            new_files = [a for a in analyses if a.is_new]
+            modified_files = [a for a in analyses if not a.is_new]
 
         # Check for specialized categories first
         all_tests = all(a.is_test for a in analyses)
@@ -340,8 +488,10 @@ class ChangeAnalyzer:
             return ChangeCategory.RENAME_REFACTOR
 
         # Check for deletions (more removed than added)
-        total_removed = sum(a.lines_removed for a in analyses)
-        total_added = sum(a.lines_added for a in analyses)
+        if total_added is None or total_removed is None:
+            total_added = sum(a.lines_added for a in analyses)
+            total_removed = sum(a.lines_removed for a in analyses)
+
         if total_removed > total_added * 2 and not new_files:
             return ChangeCategory.DELETIONS
 
@@ -493,19 +643,36 @@ class ChangeAnalyzer:
             ChangeAnalysis with magnitude, category, and context information.
         """
         file_analyses = []
+        new_files = []
+        modified_files = []
+        total_added = 0
+        total_removed = 0
 
+        # @note totals and buckets are accumulated while the files are analyzed
         for file in files:
             is_new = file.type.value == "untracked"
 
             if is_new:
                 analysis = self._analyze_new_file(file.name, file.content)
+                new_files.append(analysis)
             else:
                 analysis = self._analyze_modified_file(file.name, file.content)
+                modified_files.append(analysis)
 
             file_analyses.append(analysis)
+            total_added += analysis.lines_added
+            total_removed += analysis.lines_removed
 
-        magnitude = self._determine_magnitude(file_analyses)
-        category = self._determine_category(file_analyses)
+        magnitude = self._determine_magnitude(
+            file_analyses, total_changes=total_added + total_removed
+        )
+        category = self._determine_category(
+            file_analyses,
+            new_files=new_files,
+            modified_files=modified_files,
+            total_added=total_added,
+            total_removed=total_removed,
+        )
         suggested_types = self._suggest_commit_types(file_analyses, category)
         warnings = self._generate_warnings(file_analyses, magnitude)
         context_hints = self._generate_context_hints(file_analyses)
@@ -514,10 +681,10 @@ class ChangeAnalyzer:
             magnitude=magnitude,
             category=category,
             total_files=len(file_analyses),
-            new_files_count=sum(1 for a in file_analyses if a.is_new),
-            modified_files_count=sum(1 for a in file_analyses if not a.is_new),
-            total_lines_added=sum(a.lines_added for a in file_analyses),
-            total_lines_removed=sum(a.lines_removed for a in file_analyses),
+            new_files_count=len(new_files),
+            modified_files_count=len(modified_files),
+            total_lines_added=total_added,
+            total_lines_removed=total_removed,
             file_analyses=file_analyses,
             suggested_types=suggested_types,
             warnings=warnings,
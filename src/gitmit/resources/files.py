@@ -1,11 +1,24 @@
 """Module for manipulating files."""
 
+import fnmatch
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Union
 
 from git import Repo
-from pydantic import BaseModel
+
+# Start of each file section in a unified diff
+_DIFF_HEADER_RE = re.compile(r"^diff --git ", re.MULTILINE)
+
+# Options pinning the diff format regardless of the user's git config
+_DIFF_FORMAT = ("--no-color", "--no-ext-diff", "--src-prefix=a/", "--dst-prefix=b/")
+
+# Untracked files above this size are listed without their content
+MAX_UNTRACKED_BYTES = 1024 * 1024
 
 
 class FileType(Enum):
@@ -15,7 +28,8 @@ class FileType(Enum):
     MODIFIED = "modified"
 
 
-class File(BaseModel):
+@dataclass(slots=True, frozen=True)
+class File:
     """File class"""
 
     name: str
@@ -35,6 +49,52 @@ class GitignoreParser:
         self.patterns = [
             p.strip() for p in patterns if p.strip() and not p.startswith("#")
         ]
+        self._rules = self._compile(self.patterns)
+        self._cache: dict[str, bool] = {}
+
+    @staticmethod
+    def _compile(
+        patterns: list[str],
+    ) -> list[tuple[bool, re.Pattern[str], re.Pattern[str] | None]]:
+        """
+        Translate the patterns once into fused regexes.
+
+        Consecutive patterns with the same outcome are joined in a single
+        alternation, which keeps the first-match-wins order of the list.
+
+        Returns:
+            A list of (ignore, path regex, basename regex) rules.
+        """
+        rules: list[tuple[bool, list[str], list[str]]] = []
+
+        for pattern in patterns:
+            # Handle directory patterns (ending with /)
+            if pattern.endswith("/"):
+                ignore, path, name = True, r"(?:\A|/)" + re.escape(pattern), None
+            # Handle negation patterns
+            elif pattern.startswith("!"):
+                ignore, path, name = False, r"\A" + fnmatch.translate(pattern[1:]), None
+            # Standard pattern matching
+            else:
+                name = fnmatch.translate(pattern)
+                ignore, path = True, r"\A" + name
+
+            if not rules or rules[-1][0] is not ignore:
+                rules.append((ignore, [], []))
+
+            rules[-1][1].append(path)
+
+            if name is not None:
+                rules[-1][2].append(name)
+
+        return [
+            (
+                ignore,
+                re.compile("|".join(f"(?:{p})" for p in paths)),
+                re.compile("|".join(f"(?:{n})" for n in names)) if names else None,
+            )
+            for ignore, paths, names in rules
+        ]
 
     @classmethod
     def from_file(cls, repo_path: Path) -> "GitignoreParser":
@@ -51,22 +111,21 @@ class GitignoreParser:
 
     def should_ignore(self, filepath: str) -> bool:
         """Check if a filepath should be ignored."""
-        from fnmatch import fnmatch
+        if filepath in self._cache:
+            return self._cache[filepath]
 
-        for pattern in self.patterns:
-            # Handle directory patterns (ending with /)
-            if pattern.endswith("/"):
-                if filepath.startswith(pattern) or f"/{pattern}" in filepath:
-                    return True
-            # Handle negation patterns
-            elif pattern.startswith("!"):
-                if fnmatch(filepath, pattern[1:]):
-                    return False
-            # Standard pattern matching
-            elif fnmatch(filepath, pattern) or fnmatch(Path(filepath).name, pattern):
-                return True
+        # @note git paths always use "/", so pathlib is not needed for the name
+        name = filepath.rsplit("/", 1)[-1]
+        result = False
 
-        return False
+        for ignore, path_re, name_re in self._rules:
+            if path_re.search(filepath) or (name_re and name_re.match(name)):
+                result = ignore
+                break
+
+        # @note patterns never change after __init__, so results are stable
+        self._cache[filepath] = result
+        return result
 
 
 def _get_gitignore_parser(repo: Repo) -> GitignoreParser | None:
@@ -99,28 +158,60 @@ def load_untracked_files(
     Returns:
         list[File]: A collection of all untracked files.
     """
-    files = []
     repo_path = Path(repo.working_dir)
 
-    for file in repo.untracked_files:
-        # Check if file should be ignored
-        if ignore_parser and ignore_parser.should_ignore(file):
-            continue
+    # Skip files that should be ignored
+    lookup = [
+        file
+        for file in repo.untracked_files
+        if not (ignore_parser and ignore_parser.should_ignore(file))
+    ]
+
+    if not lookup:
+        return []
+
+    # @note reads release the GIL, so files are read concurrently
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+        return list(ex.map(lambda file: _read_untracked(repo_path, file), lookup))
+
+
+def _read_untracked(repo_path: Path, file: str) -> File:
+    """Read an untracked file.
+
+    Args:
+        repo_path (Path): Working directory of the repository.
+        file (str): Path of the file relative to the repository.
 
-        try:
-            file_path = repo_path / file
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                files.append(File(name=file, content=content, type=FileType.UNTRACKED))
-        except Exception:
-            files.append(
-                File(
-                    name=file, content="<binary or unreadable>", type=FileType.UNTRACKED
+    Returns:
+        File: The file with its content, or a placeholder if it cannot be read.
+    """
+    placeholder = File(
+        name=file, content="<binary or unreadable>", type=FileType.UNTRACKED
+    )
+
+    try:
+        with open(repo_path / file, "rb") as f:
+            # @note generated or vendored files this large say little about the commit
+            if os.fstat(f.fileno()).st_size > MAX_UNTRACKED_BYTES:
+                return File(
+                    name=file, content="<large file skipped>", type=FileType.UNTRACKED
                 )
-            )
-            continue
 
-    return files
+            head = f.read(4096)
+
+            # @note a NUL byte in the first block marks a binary file
+            if b"\x00" in head:
+                return placeholder
+
+            data = head + f.read(MAX_UNTRACKED_BYTES - len(head))
+    except OSError:
+        return placeholder
+
+    return File(
+        name=file,
+        content=data.decode("utf-8", errors="replace"),
+        type=FileType.UNTRACKED,
+    )
 
 
 def load_modified_files(
@@ -138,32 +229,68 @@ def load_modified_files(
     files = []
 
     try:
-        lookup = repo.git.diff("HEAD", "--name-only").splitlines()
+        names = [
+            name
+            for name in repo.git.diff("HEAD", "--name-only", "-z").split("\0")
+            if name
+        ]
+        # @note a single diff for all files, split by its per-file headers
+        full = repo.git.diff("HEAD", *_DIFF_FORMAT)
     except Exception:
         # Repository might not have any commits yet
         return files
 
-    for file in lookup:
+    starts = [header.start() for header in _DIFF_HEADER_RE.finditer(full)]
+
+    # @note both diffs list the files in the same order, one section per file
+    if len(starts) == len(names):
+        ends = starts[1:] + [len(full)]
+        contents = [
+            full[start:end].removesuffix("\n") for start, end in zip(starts, ends)
+        ]
+    else:
+        contents = None
+
+    for index, file in enumerate(names):
         # Check if file should be ignored
         if ignore_parser and ignore_parser.should_ignore(file):
             continue
 
-        try:
-            files.append(
-                File(
-                    name=file,
-                    content=repo.git.diff("HEAD", "--", file),
-                    type=FileType.MODIFIED,
-                )
-            )
-        except Exception as e:
-            # File might have been deleted or is binary
-            print(f"Warning: Cannot load file {file}: {e}")
-            continue
+        if contents is not None:
+            content = contents[index]
+        else:
+            try:
+                content = repo.git.diff("HEAD", *_DIFF_FORMAT, "--", file)
+            except Exception as e:
+                # File might have been deleted or is binary
+                print(f"Warning: Cannot load file {file}: {e}")
+                continue
+
+        files.append(File(name=file, content=content, type=FileType.MODIFIED))
 
     return files
 
 
+def load_changed_files(
+    repo: Repo, ignore_parser: GitignoreParser | None = None
+) -> list[File]:
+    """Load untracked and modified files from the given repository.
+
+    Args:
+        repo (Repo): Current git repository.
+        ignore_parser: Optional parser for .gitmitignore patterns.
+
+    Returns:
+        list[File]: Untracked files followed by modified files.
+    """
+    # @note git status and git diff run as separate processes, so overlap them
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        untracked = ex.submit(load_untracked_files, repo, ignore_parser)
+        modified = ex.submit(load_modified_files, repo, ignore_parser)
+
+        return untracked.result() + modified.result()
+
+
 def load_all(repo: Repo, debug: bool = False) -> Union[str, None]:
     """Load all untracked and modified files as raw string.
 
@@ -176,7 +303,7 @@ def load_all(repo: Repo, debug: bool = False) -> Union[str, None]:
         None: If no changes were found on current repository.
     """
     parser = _get_gitignore_parser(repo)
-    files = load_untracked_files(repo, parser) + load_modified_files(repo, parser)
+    files = load_changed_files(repo, parser)
 
     if not files or len(files) == 0:
         return None
@@ -187,11 +314,7 @@ def load_all(repo: Repo, debug: bool = False) -> Union[str, None]:
             print(f"  {file.name} ({file.type.value})")
         print()
 
-    txt = []
-
-    for file in files:
-        txt.append(f">>>> {file.name} ({file.type.value})")
-        txt.append(file.content)
-        txt.append("<<<< end of file")
-
-    return "\n".join(txt)
+    return "\n".join(
+        f">>>> {file.name} ({file.type.value})\n{file.content}\n<<<< end of file"
+        for file in files
+    )
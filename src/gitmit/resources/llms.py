@@ -1,24 +1,46 @@
 """Utilities for the LLM."""
 
+import functools
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, List
 
-import git
-
-from .analyzer import ChangeAnalysis, ChangeAnalyzer
+from .analyzer import ChangeAnalysis, ChangeAnalyzer, ChangeCategory, ChangeMagnitude
 from .files import (
     File,
     _get_gitignore_parser,
     load_all,
-    load_modified_files,
-    load_untracked_files,
+    load_changed_files,
 )
 from .prompts import PromptBuilder, PromptPair
 from .types import get_commit_types_resume
 
+if TYPE_CHECKING:
+    import git
+
+
+@functools.lru_cache(maxsize=1)
+def _default_analyzer() -> ChangeAnalyzer:
+    """Create the analyzer shared by generators, it keeps no state between calls."""
+    return ChangeAnalyzer()
+
+
+@functools.lru_cache(maxsize=1)
+def _resume_context() -> str:
+    """Render the synthetic analysis used for resume-based prompts, once."""
+    return ChangeAnalysis(
+        magnitude=ChangeMagnitude.MEDIUM,
+        category=ChangeCategory.MIXED,
+        total_files=0,
+        new_files_count=0,
+        modified_files_count=0,
+        total_lines_added=0,
+        total_lines_removed=0,
+        context_hints=["Generated from resume - detailed analysis not available"],
+    ).to_context_string()
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CommitPromptResult:
     """Result of building a commit prompt."""
 
@@ -52,19 +74,22 @@ class CommitPromptGenerator:
     - Building appropriate prompts based on analysis
     """
 
-    def __init__(self, prompts_dir: Path | None = None):
+    def __init__(
+        self, prompts_dir: Path | None = None, analyzer: ChangeAnalyzer | None = None
+    ):
         """
         Initialize the generator.
 
         Args:
             prompts_dir: Optional custom directory for prompt templates.
+            analyzer: Optional analyzer, defaults to one shared by all generators.
         """
-        self.analyzer = ChangeAnalyzer()
+        self.analyzer = analyzer or _default_analyzer()
         self.builder = PromptBuilder(prompts_dir)
 
     def generate(
         self,
-        repo: git.Repo,
+        repo: "git.Repo",
         explanation: str | None = None,
         no_feat: bool = False,
         debug: bool = False,
@@ -83,9 +108,7 @@ class CommitPromptGenerator:
         """
         # Load files
         parser = _get_gitignore_parser(repo)
-        untracked = load_untracked_files(repo, parser)
-        modified = load_modified_files(repo, parser)
-        files = untracked + modified
+        files = load_changed_files(repo, parser)
 
         if not files:
             return None
@@ -136,36 +159,21 @@ class CommitPromptGenerator:
         """
         # For resume-based generation, we use MEDIUM magnitude as default
         # since we don't have the raw files to analyze
-        from .analyzer import ChangeAnalysis, ChangeCategory, ChangeMagnitude
-
-        # Create a synthetic analysis for template selection
-        synthetic_analysis = ChangeAnalysis(
-            magnitude=ChangeMagnitude.MEDIUM,
-            category=ChangeCategory.MIXED,
-            total_files=0,
-            new_files_count=0,
-            modified_files_count=0,
-            total_lines_added=0,
-            total_lines_removed=0,
-            context_hints=["Generated from resume - detailed analysis not available"],
-        )
-
-        return self.builder.build_commit_prompt(
+        return self.builder.build_commit_prompt_raw(
             changes_content=resume,
             commit_types_csv=get_commit_types_resume(),
-            analysis=synthetic_analysis,
+            magnitude=ChangeMagnitude.MEDIUM,
+            context_string=_resume_context(),
             user_explanation=explanation,
             no_feat=no_feat,
         )
 
     def _build_changes_string(self, files: List[File]) -> str:
         """Build the raw changes string from file list."""
-        txt = []
-        for file in files:
-            txt.append(f">>>> {file.name} ({file.type.value})")
-            txt.append(file.content)
-            txt.append("<<<< end of file")
-        return "\n".join(txt)
+        return "\n".join(
+            f">>>> {file.name} ({file.type.value})\n{file.content}\n<<<< end of file"
+            for file in files
+        )
 
     def _print_debug(self, analysis: ChangeAnalysis, files: List[File]):
         """Print debug information about the analysis."""
@@ -202,7 +210,7 @@ class CommitPromptGenerator:
 
 
 def generate_resume_prompt(
-    repo: git.Repo,
+    repo: "git.Repo",
     explanation: str | None = None,
     prompts_dir: Path | None = None,
 ) -> str | None:
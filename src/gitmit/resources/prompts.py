@@ -5,13 +5,35 @@ This module handles loading, caching, and rendering prompt templates
 for commit message generation.
 """
 
-import pkgutil
 import re
+import threading
 from dataclasses import dataclass
+from importlib.resources import files
 from pathlib import Path
+from typing import ClassVar
 
 from .analyzer import ChangeAnalysis, ChangeMagnitude
 
+# Section added to user prompts when the user explains the changes
+_EXPLANATION_SECTION = """
+## USER EXPLANATION (HIGH PRIORITY)
+⚠️ **The user has provided context. Use this as your PRIMARY guide for categorization.**
+
+> {explanation}
+
+This explanation should:
+1. Guide your choice of commit type
+2. Influence your description wording
+3. Be reflected in the final message
+"""
+
+# Section added to user prompts when `feat` must not be used
+_NO_FEAT_WARNING = """
+## ⚠️ EXPLICIT INSTRUCTION: NO FEAT TYPE
+The user has indicated this is NOT a feature. Do NOT use the `feat` commit type.
+Choose from: enhancement, refactor, chore, bugfix, style, or other appropriate types.
+"""
+
 
 @dataclass
 class PromptPair:
@@ -35,16 +57,24 @@ class PromptBuilder:
     # Placeholder pattern: {{PLACEHOLDER_NAME}}
     PLACEHOLDER_PATTERN = re.compile(r"\{\{(\w+)\}\}")
 
+    # @note templates are shared by every builder, keyed by (prompts_dir, name)
+    # and stored with the mtime of custom files, or None for packaged ones
+    _shared_cache: ClassVar[dict[tuple[str | None, str], tuple[int | None, str]]] = {}
+    _shared_compiled: ClassVar[
+        dict[tuple[str | None, str], tuple[str, list[str], list[str]]]
+    ] = {}
+    _cache_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(self, prompts_dir: Path | None = None):
         """
         Initialize the PromptBuilder.
 
         Args:
             prompts_dir: Directory containing prompt templates.
-                        If None, uses pkgutil to load from package resources.
+                        If None, loads them from package resources.
         """
         self.prompts_dir = Path(prompts_dir) if prompts_dir else None
-        self._cache: dict[str, str] = {}
+        self._dir_key = str(self.prompts_dir) if self.prompts_dir else None
 
     def _load_template(self, name: str) -> str:
         """
@@ -59,9 +89,54 @@ class PromptBuilder:
         Raises:
             FileNotFoundError: If template doesn't exist
         """
-        if name in self._cache:
-            return self._cache[name]
+        key = (self._dir_key, name)
+        mtime = self._template_mtime(name)
+        cached = self._shared_cache.get(key)
+
+        # @note edited custom templates are reloaded, unchanged ones are reused
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with self._cache_lock:
+            cached = self._shared_cache.get(key)
+
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, self._read_template(name))
+                self._shared_cache[key] = cached
+
+        return cached[1]
+
+    def _template_mtime(self, name: str) -> int | None:
+        """
+        Get the modification time of a custom template.
+
+        Args:
+            name: Template name (without .txt extension)
+
+        Returns:
+            The mtime in nanoseconds, or None for packaged or missing templates
+        """
+        if not self.prompts_dir:
+            return None
+
+        try:
+            return (self.prompts_dir / f"{name}.txt").stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_template(self, name: str) -> str:
+        """
+        Read a template file from the prompts directory or the package.
+
+        Args:
+            name: Template name (without .txt extension)
+
+        Returns:
+            Template content as string
 
+        Raises:
+            FileNotFoundError: If template doesn't exist
+        """
         if self.prompts_dir:
             template_path = self.prompts_dir / f"{name}.txt"
 
@@ -72,43 +147,70 @@ class PromptBuilder:
 
             content = template_path.read_text(encoding="utf-8")
         else:
+            # @note resolved through the package loader, so it also works when zipped
+            template = files(__package__) / ".prompts" / f"{name}.txt"
+
             try:
-                data = pkgutil.get_data("gitmit.resources", f".prompts/{name}.txt")
+                content = template.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                raise FileNotFoundError(
+                    f"Template '{name}' not found in package at {template}"
+                )
 
-                if data is None:
-                    raise FileNotFoundError()
+        return content
 
-                content = data.decode("utf-8")
-            except (FileNotFoundError, ModuleNotFoundError):
-                template_path = Path(__file__).parent / ".prompts" / f"{name}.txt"
+    def _compile_template(self, name: str) -> tuple[list[str], list[str]]:
+        """
+        Split a template into literal chunks and placeholder names, once.
 
-                if not template_path.exists():
-                    raise FileNotFoundError(
-                        f"Template '{name}' not found in package or at {template_path}"
-                    )
+        Args:
+            name: Template name (without .txt extension)
 
-                content = template_path.read_text(encoding="utf-8")
+        Returns:
+            Literals and keys, where `literals[i]` precedes `keys[i]` and the
+            last literal follows the last placeholder
+        """
+        key = (self._dir_key, name)
+        template = self._load_template(name)
+        compiled = self._shared_compiled.get(key)
 
-        self._cache[name] = content
-        return content
+        # @note a reloaded template is a new string, so it is compiled again
+        if compiled is not None and compiled[0] is template:
+            return compiled[1], compiled[2]
+
+        literals: list[str] = []
+        keys: list[str] = []
+        start = 0
+
+        for match in self.PLACEHOLDER_PATTERN.finditer(template):
+            literals.append(template[start : match.start()])
+            keys.append(match.group(1))
+            start = match.end()
+
+        literals.append(template[start:])
 
-    def _substitute(self, template: str, values: dict[str, str]) -> str:
+        self._shared_compiled[key] = (template, literals, keys)
+        return literals, keys
+
+    def _render(self, name: str, values: dict[str, str]) -> str:
         """
-        Substitute placeholders in template with values.
+        Render a template, substituting its placeholders with values.
 
         Args:
-            template: Template string with {{PLACEHOLDER}} markers
+            name: Template name (without .txt extension)
             values: Dictionary mapping placeholder names to values
 
         Returns:
-            Template with placeholders replaced
+            Template with placeholders replaced, unknown ones left as is
         """
+        literals, keys = self._compile_template(name)
+        out = [literals[0]]
 
-        def replacer(match: re.Match[str]) -> str:
-            key = match.group(1)
-            return values.get(key, match.group(0))
+        for key, literal in zip(keys, literals[1:]):
+            out.append(values.get(key, "{{" + key + "}}"))
+            out.append(literal)
 
-        return self.PLACEHOLDER_PATTERN.sub(replacer, template)
+        return "".join(out)
 
     def _select_user_template(self, magnitude: ChangeMagnitude) -> str:
         """
@@ -140,17 +242,7 @@ class PromptBuilder:
         if not explanation:
             return ""
 
-        return f"""
-## USER EXPLANATION (HIGH PRIORITY)
-⚠️ **The user has provided context. Use this as your PRIMARY guide for categorization.**
-
-> {explanation}
-
-This explanation should:
-1. Guide your choice of commit type
-2. Influence your description wording
-3. Be reflected in the final message
-"""
+        return _EXPLANATION_SECTION.format(explanation=explanation)
 
     def build_commit_prompt(
         self,
@@ -173,41 +265,57 @@ This explanation should:
         Returns:
             PromptPair with system and user prompts
         """
-        # Load templates
-        system_template = self._load_template("commit_system")
-        user_template_name = self._select_user_template(analysis.magnitude)
-        user_template = self._load_template(user_template_name)
+        return self.build_commit_prompt_raw(
+            changes_content=changes_content,
+            commit_types_csv=commit_types_csv,
+            magnitude=analysis.magnitude,
+            context_string=analysis.to_context_string(),
+            user_explanation=user_explanation,
+            no_feat=no_feat,
+        )
+
+    def build_commit_prompt_raw(
+        self,
+        changes_content: str,
+        commit_types_csv: str,
+        magnitude: ChangeMagnitude,
+        context_string: str,
+        user_explanation: str | None = None,
+        no_feat: bool = False,
+    ) -> PromptPair:
+        """
+        Build a commit prompt pair from a magnitude and a rendered context.
+
+        Args:
+            changes_content: Raw string of file changes
+            commit_types_csv: CSV string of commit types
+            magnitude: Change magnitude used to select the user template
+            context_string: Change analysis already rendered for the prompt
+            user_explanation: Optional user explanation
+            no_feat: If True, add extra warning against using 'feat'
+
+        Returns:
+            PromptPair with system and user prompts
+        """
+        # Select the user template
+        user_template_name = self._select_user_template(magnitude)
 
         # Build user explanation section
         explanation_section = self._format_user_explanation_section(user_explanation)
 
         # Add no_feat warning if needed
-        no_feat_warning = ""
-
-        if no_feat:
-            no_feat_warning = """
-## ⚠️ EXPLICIT INSTRUCTION: NO FEAT TYPE
-The user has indicated this is NOT a feature. Do NOT use the `feat` commit type.
-Choose from: enhancement, refactor, chore, bugfix, style, or other appropriate types.
-"""
+        no_feat_warning = _NO_FEAT_WARNING if no_feat else ""
 
-        # Substitute in system prompt
-        system_prompt = self._substitute(
-            system_template,
-            {
-                "COMMIT_TYPES_CSV": commit_types_csv,
-            },
-        )
+        # @note one set of values serves both templates, each takes its own keys
+        values = {
+            "COMMIT_TYPES_CSV": commit_types_csv,
+            "CHANGE_ANALYSIS": context_string,
+            "CHANGES": changes_content,
+            "USER_EXPLANATION_SECTION": explanation_section + no_feat_warning,
+        }
 
-        # Substitute in user prompt
-        user_prompt = self._substitute(
-            user_template,
-            {
-                "CHANGE_ANALYSIS": analysis.to_context_string(),
-                "CHANGES": changes_content,
-                "USER_EXPLANATION_SECTION": explanation_section + no_feat_warning,
-            },
-        )
+        system_prompt = self._render("commit_system", values)
+        user_prompt = self._render(user_template_name, values)
 
         return PromptPair(
             system_prompt=system_prompt,
@@ -229,12 +337,10 @@ Choose from: enhancement, refactor, chore, bugfix, style, or other appropriate t
         Returns:
             Complete prompt string
         """
-        template = self._load_template("resume_changes")
-
         explanation_section = self._format_user_explanation_section(user_explanation)
 
-        return self._substitute(
-            template,
+        return self._render(
+            "resume_changes",
             {
                 "CHANGES": changes_content,
                 "USER_EXPLANATION_SECTION": explanation_section,
@@ -242,8 +348,11 @@ Choose from: enhancement, refactor, chore, bugfix, style, or other appropriate t
         )
 
     def clear_cache(self):
-        """Clear the template cache."""
-        self._cache.clear()
+        """Clear the cached templates of this builder's prompts directory."""
+        with self._cache_lock:
+            for cache in (self._shared_cache, self._shared_compiled):
+                for key in [k for k in cache if k[0] == self._dir_key]:
+                    del cache[key]
 
     def reload_template(self, name: str) -> str:
         """
@@ -255,6 +364,8 @@ Choose from: enhancement, refactor, chore, bugfix, style, or other appropriate t
         Returns:
             Reloaded template content
         """
-        if name in self._cache:
-            del self._cache[name]
+        with self._cache_lock:
+            self._shared_cache.pop((self._dir_key, name), None)
+            self._shared_compiled.pop((self._dir_key, name), None)
+
         return self._load_template(name)
@@ -1,11 +1,13 @@
 """Types for the project."""
 
+import functools
+from dataclasses import dataclass
 from enum import Enum
 
 from pydantic import BaseModel
 
 
-class CommitType(Enum):
+class CommitType(str, Enum):
     """The type of commit."""
 
     FEAT = "feat"
@@ -32,7 +34,8 @@ class CommitType(Enum):
     OTHER = "other"
 
 
-class CommitTypeProps(BaseModel):
+@dataclass(frozen=True, slots=True)
+class CommitTypeProps:
     """Properties for a commit type."""
 
     commit_emoji: str
@@ -52,12 +55,13 @@ class CommitMessage(BaseModel):
     reason: str
 
 
-def get_commit_types() -> list[CommitTypeProps]:
-    """Get the commit types.
+@functools.lru_cache(maxsize=1)
+def get_commit_types() -> tuple[CommitTypeProps, ...]:
+    """Get the commit types, built once per process.
 
-    Returns: A list of commit types.
+    Returns: A tuple of commit types.
     """
-    return [
+    return (
         CommitTypeProps(
             commit_emoji=":sparkles:",
             preview_emoji="✨",
@@ -212,11 +216,12 @@ def get_commit_types() -> list[CommitTypeProps]:
             commit_meaning="Any commit that does not fit into the other categories.",
             commit_title="Other",
         ),
-    ]
+    )
 
 
+@functools.lru_cache(maxsize=1)
 def get_commit_types_resume() -> str:
-    """Get the commit types resume as a CSV string.
+    """Get the commit types resume as a CSV string, built once per process.
 
     Returns: A CSV string containing the commit types.
     """
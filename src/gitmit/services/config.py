@@ -3,16 +3,16 @@
 import configparser
 import os
 from pathlib import Path
-from typing import Callable
 
 from pydantic import BaseModel
 
 from ..llms import LLMService
-from ..llms.googlellm import GoogleLLMService
-from ..llms.ollamallm import OllamaLLMService
-from ..llms.openrouterllm import OpenRouterLLMService
 from ..services.database import ConnectionModel, LLMUsageDatabaseService
 
+# Services allowed for each kind of model
+_COMMIT_SERVICES = ("google", "ollama", "openrouter")
+_RESUME_SERVICES = ("ollama",)
+
 
 class Services(BaseModel):
     """Services for the application."""
@@ -60,6 +60,72 @@ def __parse_model(model: str, allow_none: bool = False) -> dict[str, str] | None
     return {"service": parts[0], "model": parts[1]}
 
 
+def __validate_service(
+    config: configparser.ConfigParser, service: str, allowed: tuple[str, ...], kind: str
+):
+    """Check if the service is allowed and has its required parameters.
+
+    Args:
+        config (configparser.ConfigParser): The config with the service settings.
+        service (str): The service to validate.
+        allowed (tuple[str, ...]): The services allowed for this kind of model.
+        kind (str): The kind of model, used in the error message.
+    """
+    if service not in allowed:
+        raise ValueError(
+            f"Invalid {kind} service: '{service}'. Allowed services: {list(allowed)}"
+        )
+
+    match service:
+        case "google":
+            __required_param(config, "google", "api_key")
+        case "ollama":
+            __required_param(config, "ollama", "host")
+        case "openrouter":
+            __required_param(config, "openrouter", "api_key")
+
+
+def __build_service(
+    service: str,
+    config: configparser.ConfigParser,
+    model: str,
+    database: LLMUsageDatabaseService,
+) -> LLMService:
+    """Build the LLM service, importing only its own module.
+
+    Args:
+        service (str): The service to build, already validated.
+        config (configparser.ConfigParser): The config with the service settings.
+        model (str): The model to use.
+        database (LLMUsageDatabaseService): The database service for token tracking.
+
+    Returns:
+        LLMService: The LLM service.
+    """
+    match service:
+        case "google":
+            from ..llms.googlellm import GoogleLLMService
+
+            return GoogleLLMService(
+                api_key=config.get("google", "api_key"), database=database, model=model
+            )
+        case "ollama":
+            from ..llms.ollamallm import OllamaLLMService
+
+            return OllamaLLMService(host=config.get("ollama", "host"), model=model)
+        case "openrouter":
+            from ..llms.openrouterllm import OpenRouterLLMService
+
+            return OpenRouterLLMService(
+                api_key=config.get("openrouter", "api_key"),
+                database=database,
+                model=model,
+                providers=config.get("openrouter", "providers", fallback="").split(","),
+            )
+
+    raise ValueError(f"Invalid service: '{service}'")
+
+
 def __evaluate(
     config: configparser.ConfigParser, path: str, file_created: bool = False
 ):
@@ -78,29 +144,6 @@ def __evaluate(
 
     database = LLMUsageDatabaseService(connection)
 
-    services: dict[str, Callable[[configparser.ConfigParser, str], LLMService]] = {
-        "google": lambda c, m: GoogleLLMService(
-            api_key=c.get("google", "api_key"), database=database, model=m
-        ),
-        "ollama": lambda c, m: OllamaLLMService(host=c.get("ollama", "host"), model=m),
-        "openrouter": lambda c, m: OpenRouterLLMService(
-            api_key=c.get("openrouter", "api_key"),
-            database=database,
-            model=m,
-            providers=c.get("openrouter", "providers", fallback="").split(","),
-        ),
-    }
-
-    commit_validators: dict[str, Callable[[configparser.ConfigParser], None]] = {
-        "google": lambda c: __required_param(c, "google", "api_key"),
-        "ollama": lambda c: __required_param(c, "ollama", "host"),
-        "openrouter": lambda c: __required_param(c, "openrouter", "api_key"),
-    }
-
-    resume_validators: dict[str, Callable[[configparser.ConfigParser], None]] = {
-        "ollama": lambda c: __required_param(c, "ollama", "host"),
-    }
-
     commit_value = config.get("models", "commit", fallback="").strip()
     resume_value = config.get("models", "resume", fallback="").strip()
 
@@ -115,27 +158,19 @@ def __evaluate(
             "Cannot load any commit model. Please, check your configuration file."
         )
 
-    try:
-        commit_validators[commit_model["service"]](config)
-    except KeyError as e:
-        raise ValueError(
-            f"Invalid commit service: '{commit_model['service']}'. "
-            f"Allowed services: {list(commit_validators.keys())}"
-        ) from e
+    __validate_service(config, commit_model["service"], _COMMIT_SERVICES, "commit")
 
     if resume_model is not None:
-        try:
-            resume_validators[resume_model["service"]](config)
-        except KeyError as e:
-            raise ValueError(
-                f"Invalid resume service: '{resume_model['service']}'. "
-                f"Allowed services: {list(resume_validators.keys())}"
-            ) from e
+        __validate_service(config, resume_model["service"], _RESUME_SERVICES, "resume")
 
     return Services(
-        commit=services[commit_model["service"]](config, commit_model["model"]),
+        commit=__build_service(
+            commit_model["service"], config, commit_model["model"], database
+        ),
         resume=(
-            services[resume_model["service"]](config, resume_model["model"])
+            __build_service(
+                resume_model["service"], config, resume_model["model"], database
+            )
             if resume_model
             else None
         ),
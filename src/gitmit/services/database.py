@@ -1,11 +1,12 @@
 """Service for the SQLite database."""
 
 import sys
-from datetime import datetime, timedelta
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
 import mysql.connector
-from pydantic import BaseModel
 
 from ..utils.terminal import display_error
 
@@ -16,7 +17,8 @@ if TYPE_CHECKING:
     MySQLConnection = PooledMySQLConnection | MySQLConnectionAbstract
 
 
-class ConnectionModel(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ConnectionModel:
     """Model for the connection to the database."""
 
     host: str
@@ -42,6 +44,7 @@ class LLMUsageDatabaseService:
         self.connection = connection
         self.mysql_client = None
         self.connected = False
+        self._pending_usage: list[tuple[int, int, int, str]] = []
 
     def start(self) -> None:
         """Start the connection to the database."""
@@ -57,7 +60,6 @@ class LLMUsageDatabaseService:
                 user=self.connection.user,
                 password=self.connection.password,
                 database=self.connection.database,
-                raise_on_warnings=False,
             )
 
             if self.mysql_client is None:
@@ -80,6 +82,8 @@ class LLMUsageDatabaseService:
         if self.connected is False:
             return
 
+        self.flush_token_usage()
+
         try:
             self.mysql_client.close()
             self.connected = False
@@ -105,7 +109,20 @@ class LLMUsageDatabaseService:
                     `month` TINYINT NOT NULL,
                     `tokens_used` MEDIUMINT NOT NULL,
                     `model` VARCHAR(255) NOT NULL,
-                    `crc_model` INT UNSIGNED GENERATED ALWAYS AS (CRC32(model)) STORED
+                    `crc_model` INT UNSIGNED GENERATED ALWAYS AS (CRC32(model)) STORED,
+                    KEY `idx_timestamp` (`timestamp`),
+                    KEY `idx_year_month_crc` (`year`, `month`, `crc_model`)
+                )
+                """
+            )
+
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS `responses_cache` (
+                    `hash` CHAR(64) NOT NULL PRIMARY KEY,
+                    `model` VARCHAR(255) NOT NULL,
+                    `response` MEDIUMTEXT NOT NULL,
+                    `created_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
                 )
                 """
             )
@@ -119,15 +136,22 @@ class LLMUsageDatabaseService:
                 cursor.close()
 
     def insert_token_usage(self, tokens_used: int, model: str) -> None:
-        """Insert the token usage into the table.
+        """Queue the token usage to be written into the table.
 
         Args:
             tokens_used (int): The number of tokens used.
         """
         timestamp = datetime.now()
 
-        year = timestamp.year
-        month = timestamp.month
+        # @note rows are written by flush_token_usage, at the latest on close
+        self._pending_usage.append(
+            (timestamp.year, timestamp.month, tokens_used, model)
+        )
+
+    def flush_token_usage(self) -> None:
+        """Write the queued token usage into the table."""
+        if not self._pending_usage:
+            return
 
         if self.mysql_client is None:
             display_error("You must start the MySQL client before continue.")
@@ -137,12 +161,13 @@ class LLMUsageDatabaseService:
         try:
             cursor = self.mysql_client.cursor()
 
-            cursor.execute(
+            cursor.executemany(
                 "INSERT INTO `tokens_counter` (`year`, `month`, `tokens_used`, `model`) VALUES (%s, %s, %s, %s)",
-                (year, month, tokens_used, model),
+                self._pending_usage,
             )
 
             self.mysql_client.commit()
+            self._pending_usage.clear()
         except Exception as e:
             display_error(f"An error occurred while inserting the token usage: {e}")
             sys.exit(1)
@@ -150,6 +175,70 @@ class LLMUsageDatabaseService:
             if cursor is not None:
                 cursor.close()
 
+    def cached_response(self, key: str) -> str | None:
+        """Get a cached LLM response.
+
+        Args:
+            key (str): The hash of the model and prompt.
+
+        Returns:
+            str: The cached response or None if there is no response for the key.
+        """
+        if self.mysql_client is None:
+            display_error("You must start the MySQL client before continue.")
+            sys.exit(1)
+
+        cursor: Any = None
+        try:
+            cursor = self.mysql_client.cursor()
+
+            cursor.execute(
+                "SELECT `response` FROM `responses_cache` WHERE `hash` = %s",
+                (key,),
+            )
+
+            fetch: tuple[Any, ...] | None = cursor.fetchone()
+
+            if fetch is None:
+                return None
+
+            return str(fetch[0])
+        except Exception as e:
+            display_error(f"An error occurred while getting the cached response: {e}")
+            sys.exit(1)
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+    def store_response(self, key: str, model: str, response: str) -> None:
+        """Cache an LLM response.
+
+        Args:
+            key (str): The hash of the model and prompt.
+            model (str): The model which generated the response.
+            response (str): The response to cache.
+        """
+        if self.mysql_client is None:
+            display_error("You must start the MySQL client before continue.")
+            sys.exit(1)
+
+        cursor: Any = None
+        try:
+            cursor = self.mysql_client.cursor()
+
+            cursor.execute(
+                "REPLACE INTO `responses_cache` (`hash`, `model`, `response`) VALUES (%s, %s, %s)",
+                (key, model, response),
+            )
+
+            self.mysql_client.commit()
+        except Exception as e:
+            display_error(f"An error occurred while caching the response: {e}")
+            sys.exit(1)
+        finally:
+            if cursor is not None:
+                cursor.close()
+
     def current_month_tokens_used(self, model: str) -> int:
         """Get the current month tokens used.
 
@@ -160,13 +249,19 @@ class LLMUsageDatabaseService:
             display_error("You must start the MySQL client before continue.")
             sys.exit(1)
 
+        self.flush_token_usage()
+
+        now = datetime.now()
+
         cursor: Any = None
         try:
             cursor = self.mysql_client.cursor(dictionary=True)
 
+            # @note zlib.crc32 matches MySQL's CRC32, so the generated column
+            # is compared against a constant instead of a per-query function call
             cursor.execute(
-                "SELECT SUM(`tokens_used`) as `tokens_used` FROM `tokens_counter` WHERE `year` = %s AND `month` = %s AND (`crc_model` = CRC32(%s) AND `model` = %s)",
-                (datetime.now().year, datetime.now().month, model, model),
+                "SELECT SUM(`tokens_used`) as `tokens_used` FROM `tokens_counter` WHERE `year` = %s AND `month` = %s AND (`crc_model` = %s AND `model` = %s)",
+                (now.year, now.month, zlib.crc32(model.encode()), model),
             )
 
             fetch: dict[str, Any] | None = cursor.fetchone()
@@ -185,7 +280,7 @@ class LLMUsageDatabaseService:
                 cursor.close()
 
     def flush_old_tokens(self) -> None:
-        """Flush old tokens usage before last 30 days."""
+        """Flush old tokens usage and cached responses before last 30 days."""
         if self.mysql_client is None:
             display_error("You must start the MySQL client before continue.")
             sys.exit(1)
@@ -194,9 +289,13 @@ class LLMUsageDatabaseService:
         try:
             cursor = self.mysql_client.cursor()
 
+            # @note the cutoff is computed by MySQL, so it compares against the index
+            cursor.execute(
+                "DELETE FROM `tokens_counter` WHERE `timestamp` < NOW() - INTERVAL 30 DAY"
+            )
+
             cursor.execute(
-                "DELETE FROM `tokens_counter` WHERE `timestamp` < %s",
-                ((datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d %H:%M:%S"),),
+                "DELETE FROM `responses_cache` WHERE `created_at` < NOW() - INTERVAL 30 DAY"
             )
 
             self.mysql_client.commit()
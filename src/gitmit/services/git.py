@@ -1,5 +1,6 @@
 """Git service."""
 
+import os
 from typing import TYPE_CHECKING
 
 from git import Git, InvalidGitRepositoryError, NoSuchPathError, Repo
@@ -244,7 +245,10 @@ class GitService:
         Raises:
             ValueError: If the path is not a valid Git repository.
         """
+        # @note skip the upward walk when the path is the repository root
+        search = not os.path.exists(os.path.join(target, ".git"))
+
         try:
-            return Repo(target, search_parent_directories=True)
+            return Repo(target, search_parent_directories=search)
         except (InvalidGitRepositoryError, NoSuchPathError):
             raise RuntimeError(f"You must have a git repository on path '{target}'.")
@@ -34,6 +34,7 @@ class CommitSettings(BaseModel):
     no_feat: bool = False
     debug: bool = False
     dry_run: bool = False
+    candidates: int = 1
 
 
 class CommitTool:
@@ -144,10 +145,25 @@ class CommitTool:
                 if not keep:
                     return self.__manual_commit()
 
-        # @note second, estimate count usage for current prompt
+        # @note the explanation is part of the prompt, so ask it before the estimate
+        if self.settings.brief is None:
+            explanation = ask(
+                "[bold yellow]?[/bold yellow] May briefly explain your changes",
+                required=False,
+                default=None,
+                clean=False,
+            )
+        else:
+            explanation = self.settings.brief
+
+        # @note second, estimate count usage for the same prompt that is sent
         if self.services.commit.supports(LLMAction.COUNT_TOKENS):
             response = self.services.commit.count_tokens(
-                self.__get_repo(), explanation=None, resume=self.services.resume
+                self.__get_repo(),
+                explanation=explanation,
+                resume=self.services.resume,
+                no_feat=self.settings.no_feat,
+                debug=self.settings.debug,
             )
 
             display_info(
@@ -171,23 +187,16 @@ class CommitTool:
                     return self.__manual_commit()
 
         # @note generate commit message
-        if self.settings.brief is None:
-            explanation = ask(
-                "[bold yellow]?[/bold yellow] May briefly explain your changes",
-                required=False,
-                default=None,
-                clean=False,
-            )
+        if self.settings.candidates > 1:
+            commit_message = self.__choose_candidate(explanation)
         else:
-            explanation = self.settings.brief
-
-        commit_message = self.services.commit.commit_message(
-            self.__get_repo(),
-            explanation=explanation,
-            resume=self.services.resume,
-            no_feat=self.settings.no_feat,
-            debug=self.settings.debug,
-        )
+            commit_message = self.services.commit.commit_message(
+                self.__get_repo(),
+                explanation=explanation,
+                resume=self.services.resume,
+                no_feat=self.settings.no_feat,
+                debug=self.settings.debug,
+            )
 
         if commit_message is None:
             display_error(
@@ -221,6 +230,36 @@ class CommitTool:
             founded_type,
         )
 
+    def __choose_candidate(self, explanation: str | None) -> CommitMessage | None:
+        """Generate commit message candidates and let the user pick one.
+
+        Args:
+            explanation (str, optional): The explanation of the changes.
+
+        Returns:
+            CommitMessage: The chosen commit message or None if there is no candidate.
+        """
+        candidates = self.services.commit.commit_message_candidates(
+            self.__get_repo(),
+            explanation=explanation,
+            resume=self.services.resume,
+            no_feat=self.settings.no_feat,
+            debug=self.settings.debug,
+            k=self.settings.candidates,
+        )
+
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
+
+        choice = choose(
+            "Choose your commit message",
+            [f"{x.type.value}({x.scope}): {x.short_description}" for x in candidates],
+            default=1,
+            clean=False,
+        )
+
+        return candidates[choice]
+
     def __manual_commit(self):
         """Commit manually."""
         console.print(Panel("> Build your commit message manually", style="bold cyan"))
@@ -1,4 +1,5 @@
 import argparse
+import functools
 import os
 import pathlib
 import re
@@ -83,6 +84,30 @@ class CheckRepoAction(argparse.Action):
         parser.error("The repository is not valid.")
 
 
+class CheckCandidatesAction(argparse.Action):
+    # @note Gemini rejects more than 8 candidates in a single request
+    MAX_CANDIDATES = 8
+
+    @override
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: str | Sequence[str] | None,
+        option_string: str | None = None,
+    ) -> None:
+        if not isinstance(values, int):
+            parser.error("The number of candidates must be an integer.")
+
+        if 1 <= values <= self.MAX_CANDIDATES:
+            setattr(namespace, self.dest, values)
+            return
+
+        parser.error(
+            f"The number of candidates must be between 1 and {self.MAX_CANDIDATES}."
+        )
+
+
 def __commit_parser(subparsers: "_SubParsers") -> argparse.ArgumentParser:
     parser = subparsers.add_parser("commit", help="Commit all changes.")
 
@@ -127,6 +152,15 @@ def __commit_parser(subparsers: "_SubParsers") -> argparse.ArgumentParser:
         action="store_true",
     )
 
+    _ = parser.add_argument(
+        "-c",
+        "--candidates",
+        help="Number of commit messages to generate and choose from (1 to 8).",
+        type=int,
+        default=1,
+        action=CheckCandidatesAction,
+    )
+
     _ = parser.add_argument(
         "--dry-run",
         help="Run everything except git operations (commit and push). Useful for testing.",
@@ -224,7 +258,8 @@ def __versioning_parser(subparsers: "_SubParsers") -> argparse.ArgumentParser:
     return parser
 
 
-def parse_args(version: str) -> argparse.Namespace:
+@functools.lru_cache(maxsize=1)
+def __build_parser(version: str) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="GitMit",
         description="GitMit: A simple Git repository manager based on GitFlow requirements.",
@@ -261,4 +296,8 @@ def parse_args(version: str) -> argparse.Namespace:
     _ = __merge_parser(subparsers)
     _ = __update_parser(subparsers)
     _ = __versioning_parser(subparsers)
-    return parser.parse_args()
+    return parser
+
+
+def parse_args(version: str) -> argparse.Namespace:
+    return __build_parser(version).parse_args()
@@ -1,13 +1,46 @@
 """Module for displaying messages in the terminal."""
 
+import sys
 from typing import Callable
 
 from rich.console import Console, RenderableType
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.text import Text
 
 console = Console()
 
+# @note when piped (CI, scripts) messages skip Rich layout and go out as plain text
+_IS_TTY = sys.stdout.isatty()
+
+
+def _plain_text(message: str | RenderableType) -> str | None:
+    """Convert a message to plain text for non-interactive output.
+
+    Args:
+        message: The message to convert.
+
+    Returns:
+        str: The plain text or None if the renderable cannot be flattened.
+    """
+    if isinstance(message, str):
+        return Text.from_markup(message).plain
+
+    if isinstance(message, Panel) and isinstance(message.renderable, str):
+        body = Text.from_markup(message.renderable).plain
+
+        if message.title is None:
+            return body
+
+        title = message.title
+
+        if not isinstance(title, Text):
+            title = Text.from_markup(title)
+
+        return f"{title.plain}\n{body}"
+
+    return None
+
 
 def display_success(message: str | RenderableType) -> None:
     """Display a success message.
@@ -15,6 +48,10 @@ def display_success(message: str | RenderableType) -> None:
     Args:
         message (str): The message to display.
     """
+    if not _IS_TTY and (text := _plain_text(message)) is not None:
+        print(text)
+        return
+
     if isinstance(message, str):
         console.print(message, style="bold green")
     else:
@@ -27,6 +64,10 @@ def display_error(message: str | RenderableType) -> None:
     Args:
         message (str): The message to display.
     """
+    if not _IS_TTY and (text := _plain_text(message)) is not None:
+        print(text)
+        return
+
     if isinstance(message, str):
         console.print(message, style="bold red")
     else:
@@ -39,6 +80,10 @@ def display_warning(message: str | RenderableType) -> None:
     Args:
         message (str): The message to display.
     """
+    if not _IS_TTY and (text := _plain_text(message)) is not None:
+        print(text)
+        return
+
     if isinstance(message, str):
         console.print(message, style="bold yellow")
     else:
@@ -51,6 +96,10 @@ def display_info(message: str | RenderableType) -> None:
     Args:
         message: The message to display (can be str, Panel, Table, etc).
     """
+    if not _IS_TTY and (text := _plain_text(message)) is not None:
+        print(text)
+        return
+
     if isinstance(message, str):
         console.print(message, style="bold blue")
     else: